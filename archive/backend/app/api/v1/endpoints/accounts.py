@@ -1,14 +1,19 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from decimal import Decimal
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_user_read_db
+from app.core.cache import bump_user_data_version, cached_response
+from app.core.etag import user_etag
 from app.models.user import User
 from app.models.account import Account
-from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse
+from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse, BalanceHistoryPoint
+from app.services.daily_balances import balance_history
+from app.services.timeseries import MAX_POINTS, bucket_count
 
 router = APIRouter()
 
@@ -40,16 +45,18 @@ async def create_account(
     )
     
     db.add(new_account)
-    await db.commit()
+    await db.flush()
     await db.refresh(new_account)
+    bump_user_data_version(db, current_user.id)
     
     return new_account
 
 
-@router.get("", response_model=List[AccountResponse])
+@router.get("", response_model=List[AccountResponse], dependencies=[Depends(user_etag)])
+@cached_response("accounts.list", List[AccountResponse])
 async def get_accounts(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get all accounts for current user.
@@ -72,11 +79,12 @@ async def get_accounts(
     return accounts
 
 
-@router.get("/{account_id}", response_model=AccountResponse)
+@router.get("/{account_id}", response_model=AccountResponse, dependencies=[Depends(user_etag)])
+@cached_response("accounts.detail", AccountResponse)
 async def get_account(
     account_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get a specific account by ID.
@@ -106,6 +114,60 @@ async def get_account(
     return account
 
 
+@router.get("/{account_id}/balance-history", response_model=List[BalanceHistoryPoint], dependencies=[Depends(user_etag)])
+@cached_response("accounts.balance_history", List[BalanceHistoryPoint])
+async def get_balance_history(
+    account_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: str = Query("day", regex="^(day|week|month)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """
+    Get an account's historical closing balances from the daily snapshots.
+    
+    Args:
+        account_id: Account ID
+        start: First day of the range (defaults to 30 days before `end`)
+        end: Last day of the range (defaults to today)
+        granularity: One point per day, week or month
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        List[BalanceHistoryPoint]: Closing balance per period
+        
+    Raises:
+        HTTPException: If account not found, the range is invalid or has too many points
+    """
+    result = await db.execute(
+        select(Account).filter(Account.id == account_id, Account.user_id == current_user.id)
+    )
+    account = result.scalar_one_or_none()
+    
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+    
+    end = end or date.today()
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    if bucket_count(start, end, granularity) > MAX_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large for {granularity} granularity (max {MAX_POINTS} points)"
+        )
+    
+    return await balance_history(db, account.id, account.balance, start, end, granularity)
+
+
 @router.put("/{account_id}", response_model=AccountResponse)
 async def update_account(
     account_id: int,
@@ -144,8 +206,9 @@ async def update_account(
     for field, value in update_data.items():
         setattr(account, field, value)
     
-    await db.commit()
+    await db.flush()
     await db.refresh(account)
+    bump_user_data_version(db, current_user.id)
     
     return account
 
@@ -180,4 +243,4 @@ async def delete_account(
     
     # Soft delete
     account.is_active = False
-    await db.commit()
+    bump_user_data_version(db, current_user.id)
@@ -3,15 +3,16 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.database import get_db, get_primary_read_db, after_commit
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
     get_current_user,
 )
 from app.core.config import settings
+from app.core.cache import invalidate_user_identity
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token, UserUpdate
 
@@ -36,6 +37,10 @@ async def register(
     Raises:
         HTTPException: If email already registered
     """
+    # Hash before the first query so the write transaction isn't held open
+    # while bcrypt runs
+    hashed_password = await get_password_hash_async(user_data.password)
+    
     # Check if user already exists
     result = await db.execute(select(User).filter(User.email == user_data.email))
     existing_user = result.scalar_one_or_none()
@@ -47,7 +52,6 @@ async def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -55,7 +59,7 @@ async def register(
     )
     
     db.add(new_user)
-    await db.commit()
+    await db.flush()
     await db.refresh(new_user)
     
     return new_user
@@ -64,7 +68,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     login_data: UserLogin,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_read_db)
 ):
     """
     Login user and return JWT tokens.
@@ -83,7 +87,7 @@ async def login(
     result = await db.execute(select(User).filter(User.email == login_data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -126,7 +130,7 @@ async def get_current_user_info(
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     refresh_token: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_read_db)
 ):
     """
     Refresh access token using refresh token.
@@ -216,12 +220,16 @@ async def update_profile(
                 detail="Email already registered"
             )
             
+    # current_user may come from the identity cache; update the session's row
+    user = await db.get(User, current_user.id)
+    
     # Update fields
     update_data = user_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
         
-    await db.commit()
-    await db.refresh(current_user)
+    await db.flush()
+    await db.refresh(user)
+    after_commit(db, invalidate_user_identity, user.id)
     
-    return current_user
+    return user
@@ -1,22 +1,24 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from datetime import datetime, date
-from decimal import Decimal
+from sqlalchemy import select
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_user_read_db
+from app.core.cache import bump_user_data_version, cached_response
+from app.core.etag import user_etag
 from app.models.user import User
 from app.models.budget import Budget, BudgetCategory
+from app.models.budget_alert import BudgetAlert
 from app.models.category import Category
-from app.models.transaction import Transaction, TransactionType
 from app.schemas.budget import (
     BudgetCreate,
-    BudgetUpdate,
     BudgetResponse,
-    BudgetWithProgress
+    BudgetWithProgress,
+    BudgetAlertResponse
 )
+from app.services.budgets import budget_progress, current_spent, progress_query, to_progress
+from app.services.rollups import month_start
 
 router = APIRouter()
 
@@ -46,12 +48,15 @@ async def create_budget(
         budget_id=new_budget.id,
         category_id=budget_data.category_id,
         allocated_amount=budget_data.amount,
-        spent_amount=Decimal("0.00")
+        spent_amount=await current_spent(
+            db, current_user.id, month_start(new_budget.month), budget_data.category_id
+        )
     )
     
     db.add(budget_category)
-    await db.commit()
+    await db.flush()
     await db.refresh(new_budget)
+    bump_user_data_version(db, current_user.id)
     
     # Get category name
     category_result = await db.execute(
@@ -73,172 +78,66 @@ async def create_budget(
     )
 
 
-@router.get("", response_model=List[BudgetWithProgress])
+@router.get("", response_model=List[BudgetWithProgress], dependencies=[Depends(user_etag)])
+@cached_response("budgets.list")
 async def get_budgets(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get all budgets for the current user with progress.
     """
-    # Get all budgets for user
-    result = await db.execute(
-        select(Budget)
-        .filter(Budget.user_id == current_user.id)
-        .order_by(Budget.month.desc())
-    )
-    budgets = result.scalars().all()
-    
-    budget_list = []
-    for budget in budgets:
-        # Get budget categories
-        bc_result = await db.execute(
-            select(BudgetCategory)
-            .filter(BudgetCategory.budget_id == budget.id)
-        )
-        budget_categories = bc_result.scalars().all()
-        
-        for bc in budget_categories:
-            # Get category
-            cat_result = await db.execute(
-                select(Category).filter(Category.id == bc.category_id)
-            )
-            category = cat_result.scalar_one_or_none()
-            
-            # Calculate spent amount for this category in this month
-            start_of_month = budget.month
-            end_of_month = date(start_of_month.year, start_of_month.month + 1 if start_of_month.month < 12 else 1, 1)
-            
-            spent_result = await db.execute(
-                select(func.sum(Transaction.amount))
-                .filter(
-                    and_(
-                        Transaction.user_id == current_user.id,
-                        Transaction.category_id == bc.category_id,
-                        Transaction.transaction_type == TransactionType.EXPENSE,
-                        Transaction.transaction_date >= start_of_month,
-                        Transaction.transaction_date < end_of_month
-                    )
-                )
-            )
-            spent = spent_result.scalar() or Decimal("0.00")
-            
-            # Calculate progress
-            allocated = bc.allocated_amount
-            remaining = allocated - spent
-            percentage = float((spent / allocated * 100)) if allocated > 0 else 0.0
-            
-            # Determine status
-            if percentage >= 100:
-                status_str = "exceeded"
-            elif percentage >= 80:
-                status_str = "warning"
-            else:
-                status_str = "on_track"
-            
-            budget_list.append(BudgetWithProgress(
-                id=budget.id,
-                category_id=bc.category_id,
-                amount=allocated,
-                period="monthly",
-                start_date=datetime.combine(budget.month, datetime.min.time()),
-                end_date=None,
-                user_id=current_user.id,
-                category_name=category.name if category else None,
-                created_at=budget.created_at,
-                updated_at=budget.updated_at,
-                spent=spent,
-                remaining=remaining,
-                percentage=percentage,
-                status=status_str
-            ))
+    return await budget_progress(db, current_user.id)
+
+
+@router.get("/alerts", response_model=List[BudgetAlertResponse])
+async def get_budget_alerts(
+    after_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """
+    Get budget threshold alerts recorded by the budget evaluator, newest first.
     
-    return budget_list
+    Pass the highest id already seen as `after_id` to poll for new alerts.
+    """
+    query = select(BudgetAlert).filter(BudgetAlert.user_id == current_user.id)
+    if after_id is not None:
+        query = query.filter(BudgetAlert.id > after_id)
+    result = await db.execute(query.order_by(BudgetAlert.id.desc()).limit(limit))
+    return result.scalars().all()
 
 
-@router.get("/{budget_id}", response_model=BudgetWithProgress)
+@router.get("/{budget_id}", response_model=BudgetWithProgress, dependencies=[Depends(user_etag)])
+@cached_response("budgets.detail")
 async def get_budget(
     budget_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get a specific budget by ID with progress.
     """
     result = await db.execute(
-        select(Budget).filter(Budget.id == budget_id, Budget.user_id == current_user.id)
+        progress_query(current_user.id, budget_id).limit(1)
     )
-    budget = result.scalar_one_or_none()
+    row = result.first()
     
-    if not budget:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Budget not found"
         )
     
-    # Get first budget category (simplified)
-    bc_result = await db.execute(
-        select(BudgetCategory).filter(BudgetCategory.budget_id == budget.id).limit(1)
-    )
-    bc = bc_result.scalar_one_or_none()
-    
-    if not bc:
+    budget, allocation, category_name = row
+    if allocation is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Budget category not found"
         )
     
-    # Get category
-    cat_result = await db.execute(
-        select(Category).filter(Category.id == bc.category_id)
-    )
-    category = cat_result.scalar_one_or_none()
-    
-    # Calculate spent
-    start_of_month = budget.month
-    end_of_month = date(start_of_month.year, start_of_month.month + 1 if start_of_month.month < 12 else 1, 1)
-    
-    spent_result = await db.execute(
-        select(func.sum(Transaction.amount))
-        .filter(
-            and_(
-                Transaction.user_id == current_user.id,
-                Transaction.category_id == bc.category_id,
-                Transaction.transaction_type == TransactionType.EXPENSE,
-                Transaction.transaction_date >= start_of_month,
-                Transaction.transaction_date < end_of_month
-            )
-        )
-    )
-    spent = spent_result.scalar() or Decimal("0.00")
-    
-    allocated = bc.allocated_amount
-    remaining = allocated - spent
-    percentage = float((spent / allocated * 100)) if allocated > 0 else 0.0
-    
-    if percentage >= 100:
-        status_str = "exceeded"
-    elif percentage >= 80:
-        status_str = "warning"
-    else:
-        status_str = "on_track"
-    
-    return BudgetWithProgress(
-        id=budget.id,
-        category_id=bc.category_id,
-        amount=allocated,
-        period="monthly",
-        start_date=datetime.combine(budget.month, datetime.min.time()),
-        end_date=None,
-        user_id=current_user.id,
-        category_name=category.name if category else None,
-        created_at=budget.created_at,
-        updated_at=budget.updated_at,
-        spent=spent,
-        remaining=remaining,
-        percentage=percentage,
-        status=status_str
-    )
+    return to_progress(budget, allocation, category_name)
 
 
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -262,4 +161,4 @@ async def delete_budget(
         )
     
     await db.delete(budget)
-    await db.commit()
+    bump_user_data_version(db, current_user.id)
@@ -1,24 +1,33 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.core.database import get_db
+from app.core.database import get_db, get_primary_read_db
 from app.core.security import get_current_user
+from app.core.cache import bump_global_data_version, cached_response
+from app.core.etag import global_etag
 from app.models.user import User
 from app.models.category import Category
+from app.models.transaction import Transaction
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.services.rollups import move_category_rollups
 
 router = APIRouter()
 
 
-@router.get("", response_model=List[CategoryResponse])
+@router.get("", response_model=List[CategoryResponse], dependencies=[Depends(global_etag)])
+@cached_response("categories.list", List[CategoryResponse])
 async def get_categories(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_read_db)
 ):
     """
     Get all categories (default and custom).
     
+    Reads from the primary: the list is cached under the global data
+    version, and a replica lagging behind a category write would get its
+    stale list cached under the new version.
+    
     Args:
         db: Database session
         
@@ -74,8 +83,9 @@ async def create_category(
     )
     
     db.add(new_category)
-    await db.commit()
+    await db.flush()
     await db.refresh(new_category)
+    bump_global_data_version(db)
     
     return new_category
 
@@ -124,8 +134,9 @@ async def update_category(
     for field, value in update_data.items():
         setattr(category, field, value)
     
-    await db.commit()
+    await db.flush()
     await db.refresh(category)
+    bump_global_data_version(db)
     
     return category
 
@@ -164,5 +175,13 @@ async def delete_category(
             detail="Cannot delete default categories"
         )
     
+    # Its transactions become uncategorized, and so do their rollups
+    await move_category_rollups(db, category.id)
+    await db.execute(
+        update(Transaction)
+        .where(Transaction.category_id == category.id)
+        .values(category_id=None)
+        .execution_options(synchronize_session=False)
+    )
     await db.delete(category)
-    await db.commit()
+    bump_global_data_version(db)
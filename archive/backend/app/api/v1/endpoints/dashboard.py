@@ -1,30 +1,36 @@
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends
+from typing import List, Dict, Any, Optional
+from datetime import datetime, date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case
 from decimal import Decimal
 
-from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_user_read_db
+from app.core.cache import cached_response
+from app.core.etag import user_etag
 from app.models.user import User
 from app.models.account import Account
 from app.models.transaction import Transaction, TransactionType
 from app.models.category import Category
+from app.models.monthly_rollup import MonthlyRollup
 from app.schemas.account import AccountSummary
 from app.schemas.transaction import TransactionResponse
+from app.services.timeseries import MAX_POINTS, bucket_count, income_expense_series
 
 router = APIRouter()
 
 
-@router.get("/overview")
+@router.get("/overview", dependencies=[Depends(user_etag)])
+@cached_response("dashboard.overview")
 async def get_dashboard_overview(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ) -> Dict[str, Any]:
     """
     Get dashboard overview with financial summary.
     
+    Results are cached per user until their data changes.
+    
     Args:
         current_user: Current authenticated user
         db: Database session
@@ -32,59 +38,52 @@ async def get_dashboard_overview(
     Returns:
         dict: Dashboard overview data
     """
-    # Get total balance across all accounts
-    balance_result = await db.execute(
-        select(func.sum(Account.balance))
-        .filter(Account.user_id == current_user.id, Account.is_active == True)
-    )
-    total_balance = balance_result.scalar() or Decimal("0.00")
-    
-    # Get current month income and expenses
     current_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0).date()
     
-    # Total income this month
-    income_result = await db.execute(
-        select(func.sum(Transaction.amount))
-        .filter(
-            Transaction.user_id == current_user.id,
-            Transaction.transaction_type == TransactionType.INCOME,
-            Transaction.transaction_date >= current_month_start
+    # Current month income and expenses from the monthly rollups
+    totals_result = await db.execute(
+        select(
+            func.sum(case(
+                (MonthlyRollup.transaction_type == TransactionType.INCOME, MonthlyRollup.total),
+                else_=0
+            )).label("income"),
+            func.sum(case(
+                (MonthlyRollup.transaction_type == TransactionType.EXPENSE, MonthlyRollup.total),
+                else_=0
+            )).label("expenses")
         )
-    )
-    monthly_income = income_result.scalar() or Decimal("0.00")
-    
-    # Total expenses this month
-    expense_result = await db.execute(
-        select(func.sum(Transaction.amount))
         .filter(
-            Transaction.user_id == current_user.id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            Transaction.transaction_date >= current_month_start
+            MonthlyRollup.user_id == current_user.id,
+            MonthlyRollup.month == current_month_start
         )
     )
-    monthly_expenses = expense_result.scalar() or Decimal("0.00")
+    totals = totals_result.one()
+    monthly_income = totals.income or Decimal("0.00")
+    monthly_expenses = totals.expenses or Decimal("0.00")
     
-    # Get account count
-    account_count_result = await db.execute(
-        select(func.count(Account.id))
+    # Total balance and count of active accounts
+    accounts_result = await db.execute(
+        select(func.sum(Account.balance).label("balance"), func.count(Account.id).label("count"))
         .filter(Account.user_id == current_user.id, Account.is_active == True)
     )
-    account_count = account_count_result.scalar()
+    accounts = accounts_result.one()
+    total_balance = accounts.balance or Decimal("0.00")
     
     return {
         "total_balance": float(total_balance),
         "monthly_income": float(monthly_income),
         "monthly_expenses": float(monthly_expenses),
         "net_monthly": float(monthly_income - monthly_expenses),
-        "account_count": account_count
+        "account_count": accounts.count
     }
 
 
-@router.get("/recent-transactions")
+@router.get("/recent-transactions", dependencies=[Depends(user_etag)])
+@cached_response("dashboard.recent_transactions", List[TransactionResponse])
 async def get_recent_transactions(
     limit: int = 10,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ) -> List[TransactionResponse]:
     """
     Get recent transactions for dashboard.
@@ -108,10 +107,11 @@ async def get_recent_transactions(
     return transactions
 
 
-@router.get("/spending-by-category")
+@router.get("/spending-by-category", dependencies=[Depends(user_etag)])
+@cached_response("dashboard.spending_by_category")
 async def get_spending_by_category(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ) -> List[Dict[str, Any]]:
     """
     Get spending breakdown by category for current month.
@@ -125,22 +125,22 @@ async def get_spending_by_category(
     """
     current_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0).date()
     
-    # Get spending by category
+    # Get spending by category from the monthly rollups
     result = await db.execute(
         select(
             Category.id,
             Category.name,
             Category.color,
-            func.sum(Transaction.amount).label("total")
+            MonthlyRollup.total
         )
-        .join(Transaction, Transaction.category_id == Category.id)
+        .join(MonthlyRollup, MonthlyRollup.category_id == Category.id)
         .filter(
-            Transaction.user_id == current_user.id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            Transaction.transaction_date >= current_month_start
+            MonthlyRollup.user_id == current_user.id,
+            MonthlyRollup.transaction_type == TransactionType.EXPENSE,
+            MonthlyRollup.month == current_month_start,
+            MonthlyRollup.count > 0
         )
-        .group_by(Category.id, Category.name, Category.color)
-        .order_by(func.sum(Transaction.amount).desc())
+        .order_by(MonthlyRollup.total.desc())
     )
     
     category_spending = []
@@ -155,10 +155,11 @@ async def get_spending_by_category(
     return category_spending
 
 
-@router.get("/accounts-summary")
+@router.get("/accounts-summary", dependencies=[Depends(user_etag)])
+@cached_response("dashboard.accounts_summary", List[AccountSummary])
 async def get_accounts_summary(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ) -> List[AccountSummary]:
     """
     Get summary of all accounts for dashboard.
@@ -180,65 +181,120 @@ async def get_accounts_summary(
     return accounts
 
 
-@router.get("/monthly-trends")
+@router.get("/monthly-trends", dependencies=[Depends(user_etag)])
+@cached_response("dashboard.monthly_trends")
 async def get_monthly_trends(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: str = Query("month", regex="^(day|week|month|year)$"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ) -> List[Dict[str, Any]]:
     """
-    Get monthly income vs expenses trends for the last 6 months.
+    Get income vs expenses trends, by default monthly for the last 6 months.
     
     Args:
+        start: First day of the range (defaults to the start of the month 180 days ago)
+        end: Last day of the range (defaults to today)
+        granularity: Bucket size: day, week, month or year
         current_user: Current authenticated user
         db: Database session
         
     Returns:
-        List[dict]: Monthly trend data
+        List[dict]: Income, expense and net per bucket. `month` repeats
+        `label` for existing clients.
+        
+    Raises:
+        HTTPException: If the range is invalid or has too many buckets
     """
-    # Calculate start date (6 months ago)
-    end_date = datetime.now()
-    start_date = (end_date - timedelta(days=180)).replace(day=1)
+    end = end or date.today()
+    start = start or (end - timedelta(days=180)).replace(day=1)
     
-    # Get monthly sums
-    result = await db.execute(
-        select(
-            func.date_trunc('month', Transaction.transaction_date).label('month'),
-            Transaction.transaction_type,
-            func.sum(Transaction.amount).label('total')
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
         )
-        .filter(
-            Transaction.user_id == current_user.id,
-            Transaction.transaction_date >= start_date
+    if bucket_count(start, end, granularity) > MAX_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large for {granularity} granularity (max {MAX_POINTS} points)"
         )
-        .group_by('month', Transaction.transaction_type)
-        .order_by('month')
-    )
     
-    # Process results into a dictionary keyed by month
-    monthly_data = {}
-    
-    # Initialize with zero values for the range
-    current_month = start_date
-    while current_month <= end_date:
-        month_key = current_month.strftime("%Y-%m")
-        monthly_data[month_key] = {
-            "month": current_month.strftime("%b %Y"),
-            "income": 0,
-            "expense": 0
-        }
-        # Move to next month
-        if current_month.month == 12:
-            current_month = current_month.replace(year=current_month.year + 1, month=1)
-        else:
-            current_month = current_month.replace(month=current_month.month + 1)
-            
-    # Fill with actual data
-    for row in result:
-        month_key = row.month.strftime("%Y-%m")
-        if month_key in monthly_data:
-            if row.transaction_type == TransactionType.INCOME:
-                monthly_data[month_key]["income"] = float(row.total)
-            elif row.transaction_type == TransactionType.EXPENSE:
-                monthly_data[month_key]["expense"] = float(row.total)
-                
-    return list(monthly_data.values())
+    series = await income_expense_series(db, current_user.id, start, end, granularity)
+    for point in series:
+        point["month"] = point["label"]
+    return series
+
+
+# Widget name -> endpoint computing it
+DASHBOARD_WIDGETS = {
+    "overview": get_dashboard_overview,
+    "recent_transactions": get_recent_transactions,
+    "spending_by_category": get_spending_by_category,
+    "accounts_summary": get_accounts_summary,
+    "monthly_trends": get_monthly_trends,
+}
+
+
+async def _snapshot(db: AsyncSession = Depends(get_user_read_db)) -> None:
+    # Runs before user_etag, whose version query would otherwise begin the
+    # session's transaction with the default isolation level
+    if db.bind.dialect.name == "postgresql":
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+
+@router.get("/bundle", dependencies=[Depends(_snapshot), Depends(user_etag)])
+async def get_dashboard_bundle(
+    widgets: Optional[str] = Query(None, description="Comma-separated widget names (default: all)"),
+    limit: int = 10,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: str = Query("month", regex="^(day|week|month|year)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_user_read_db)
+) -> Dict[str, Any]:
+    """
+    Get several dashboard widgets in one request.
+    
+    All widgets are computed from the same session. On PostgreSQL they run
+    in one REPEATABLE READ transaction so they see a single snapshot; an
+    async session cannot run statements concurrently, so widgets run one
+    after another. Each widget is still served from the response cache
+    when possible.
+    
+    Args:
+        widgets: Widgets to include, from DASHBOARD_WIDGETS
+        limit: Number of recent transactions
+        start: First day of the trends range
+        end: Last day of the trends range
+        granularity: Trends bucket size: day, week, month or year
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        dict: Widget name -> widget data
+        
+    Raises:
+        HTTPException: If a widget name is unknown or the trends range is invalid
+    """
+    names = [name.strip() for name in widgets.split(",") if name.strip()] if widgets else list(DASHBOARD_WIDGETS)
+    unknown = [name for name in names if name not in DASHBOARD_WIDGETS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown widgets: {', '.join(unknown)}"
+        )
+    
+    widget_params = {
+        "recent_transactions": {"limit": limit},
+        "monthly_trends": {"start": start, "end": end, "granularity": granularity},
+    }
+    bundle = {}
+    for name in names:
+        bundle[name] = await DASHBOARD_WIDGETS[name](
+            current_user=current_user,
+            db=db,
+            **widget_params.get(name, {})
+        )
+    return bundle
@@ -1,23 +1,42 @@
-from typing import List, Optional, Any
+from typing import Optional, Any
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
-from decimal import Decimal
+from sqlalchemy import select
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_user_read_db
+from app.core.cache import bump_user_data_version, pin_user_to_primary
+from app.core.etag import user_etag
 from app.models.user import User
 from app.models.transaction import Transaction, TransactionType
-from app.models.account import Account
-from app.models.category import Category
 from app.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionResponse,
-    TransactionWithDetails
+    TransactionWithDetails,
+    TransactionImportResult
+)
+from app.schemas.common import PaginatedResponse, CountStrategy
+from app.services.enrichment import with_details, to_details
+from app.services.pagination import TRANSACTION_ORDER, keyset_page
+from app.services.counts import count_rows
+from app.services.search import apply_search
+from app.services.export import (
+    EXPORT_FIELDS,
+    EXPORT_FORMATS,
+    DEFAULT_CSV_FIELDS,
+    export_query,
+    format_available
+)
+from app.services.effects import TransactionEffects
+from app.services.importer import (
+    IMPORT_FORMATS,
+    ROW_READERS,
+    detect_format,
+    import_transactions
 )
-from app.schemas.common import PaginatedResponse
 
 router = APIRouter()
 
@@ -42,16 +61,11 @@ async def create_transaction(
     Raises:
         HTTPException: If account not found or unauthorized
     """
-    # Verify account belongs to user
-    result = await db.execute(
-        select(Account).filter(
-            Account.id == transaction_data.account_id,
-            Account.user_id == current_user.id
-        )
-    )
-    account = result.scalar_one_or_none()
+    # Update account balance and derived data; the balance update also checks ownership
+    effects = TransactionEffects(current_user.id)
+    effects.add(transaction_data)
     
-    if not account:
+    if await effects.flush(db):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Account not found"
@@ -69,23 +83,20 @@ async def create_transaction(
         user_id=current_user.id
     )
     
-    # Update account balance
-    if transaction_data.transaction_type == TransactionType.INCOME:
-        account.balance += transaction_data.amount
-    else:  # EXPENSE
-        account.balance -= transaction_data.amount
-    
     db.add(new_transaction)
-    await db.commit()
+    await db.flush()
     await db.refresh(new_transaction)
+    bump_user_data_version(db, current_user.id)
     
     return new_transaction
 
 
-@router.get("", response_model=PaginatedResponse[TransactionWithDetails])
+@router.get("", response_model=PaginatedResponse[TransactionWithDetails], dependencies=[Depends(user_etag)])
 async def get_transactions(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count: CountStrategy = CountStrategy.EXACT,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     transaction_type: Optional[TransactionType] = None,
@@ -95,7 +106,7 @@ async def get_transactions(
     max_amount: Optional[float] = None,
     search: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get transactions with filtering and pagination.
@@ -103,6 +114,8 @@ async def get_transactions(
     Args:
         page: Page number
         size: Items per page
+        cursor: Keyset cursor; when given (empty for the first page) `page` is ignored
+        count: How to compute the total (exact, estimated or skipped)
         start_date: Filter by start date
         end_date: Filter by end date
         transaction_type: Filter by transaction type
@@ -135,65 +148,154 @@ async def get_transactions(
         query = query.filter(Transaction.amount >= min_amount)
     if max_amount is not None:
         query = query.filter(Transaction.amount <= max_amount)
+    relevance = None
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Transaction.description.ilike(search_term),
-                Transaction.notes.ilike(search_term)
-            )
-        )
+        query, relevance = apply_search(query, search)
     
     # Get total count
-    count_query = select(func.count()).select_from(query.alias())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    filter_key = (
+        start_date, end_date, transaction_type, category_id,
+        account_id, min_amount, max_amount, search
+    )
+    total, count_strategy = await count_rows(db, query, count, current_user.id, filter_key)
+    pages = (total + size - 1) // size if total is not None else None
+    
+    if cursor is not None:
+        rows, next_cursor, prev_cursor = await keyset_page(db, with_details(query), cursor, size)
+        return PaginatedResponse(
+            items=to_details(rows),
+            total=total,
+            page=page,
+            size=size,
+            pages=pages,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+            count_strategy=count_strategy
+        )
     
-    # Apply pagination
-    query = query.order_by(Transaction.transaction_date.desc(), Transaction.created_at.desc())
+    # Apply pagination; searches list the most relevant matches first
+    if relevance is not None:
+        query = query.order_by(relevance)
+    query = query.order_by(*TRANSACTION_ORDER)
     query = query.offset((page - 1) * size).limit(size)
     
-    result = await db.execute(query)
-    transactions = result.scalars().all()
-    
-    # Enrich with account and category names
-    transactions_with_details = []
-    for transaction in transactions:
-        # Get account name
-        account_result = await db.execute(
-            select(Account.name).filter(Account.id == transaction.account_id)
-        )
-        account_name = account_result.scalar_one_or_none()
-        
-        # Get category name
-        category_name = None
-        if transaction.category_id:
-            category_result = await db.execute(
-                select(Category.name).filter(Category.id == transaction.category_id)
-            )
-            category_name = category_result.scalar_one_or_none()
-        
-        transaction_dict = {
-            **transaction.__dict__,
-            "account_name": account_name,
-            "category_name": category_name
-        }
-        transactions_with_details.append(TransactionWithDetails(**transaction_dict))
+    # Enrich with account and category names in the same round trip
+    result = await db.execute(with_details(query))
+    transactions_with_details = to_details(result.all())
     
     return PaginatedResponse(
         items=transactions_with_details,
         total=total,
         page=page,
         size=size,
-        pages=(total + size - 1) // size
+        pages=pages,
+        count_strategy=count_strategy
+    )
+
+
+@router.get("/export", response_model=Any)
+async def export_transactions(
+    format: str = Query(..., regex="^(csv|json|ndjson|parquet|arrow)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    columns: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export transactions to CSV, JSON, NDJSON, Parquet or Arrow IPC.
+    
+    Rows are streamed from a server-side cursor in chunks, so memory use
+    stays constant regardless of the size of the history.
+    
+    Args:
+        format: Export format
+        start_date: Only export transactions on or after this date
+        end_date: Only export transactions on or before this date
+        columns: Comma-separated subset of fields to export
+        current_user: Current authenticated user
+        
+    Returns:
+        StreamingResponse: Exported transactions
+        
+    Raises:
+        HTTPException: If a column is unknown or the format is unavailable
+    """
+    if columns:
+        fields = [name.strip() for name in columns.split(",") if name.strip()]
+        unknown = [name for name in fields if name not in EXPORT_FIELDS]
+        if unknown or not fields:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown export columns: {', '.join(unknown)}"
+            )
+    elif format == "csv":
+        fields = DEFAULT_CSV_FIELDS
+    else:
+        fields = list(EXPORT_FIELDS)
+    
+    if not format_available(format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Export format '{format}' is not available on this server"
+        )
+    
+    stream, media_type, extension = EXPORT_FORMATS[format]
+    query = export_query(current_user.id, fields, start_date, end_date)
+    return StreamingResponse(
+        stream(query, fields),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=transactions.{extension}"}
     )
 
 
-@router.get("/{transaction_id}", response_model=TransactionResponse)
+@router.post("/import", response_model=TransactionImportResult)
+async def import_transactions_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None, regex="^(csv|ofx|jsonl)$"),
+    account_id: Optional[int] = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk import transactions from a CSV, OFX/QFX or JSON lines file.
+    
+    Rows are validated as they are read and inserted in batches; invalid
+    rows are reported without aborting the rest of the file.
+    
+    Args:
+        file: Uploaded statement
+        format: File format; detected from the file name when omitted
+        account_id: Account for rows that do not specify one
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        TransactionImportResult: Imported and rejected row counts with errors
+        
+    Raises:
+        HTTPException: If the format cannot be determined
+    """
+    format = format or detect_format(file.filename)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import format; use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    
+    try:
+        return await import_transactions(
+            db, current_user.id, ROW_READERS[format](file.file), account_id
+        )
+    finally:
+        # Earlier batches may already be committed; each bumped the data version
+        await pin_user_to_primary(current_user.id)
+
+
+@router.get("/{transaction_id}", response_model=TransactionResponse, dependencies=[Depends(user_etag)])
 async def get_transaction(
     transaction_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """
     Get a specific transaction by ID.
@@ -248,11 +350,15 @@ async def update_transaction(
     Raises:
         HTTPException: If transaction not found or unauthorized
     """
+    # Lock the row: its old values are reverted below, and a concurrent
+    # update or delete must not revert them a second time
     result = await db.execute(
-        select(Transaction).filter(
+        select(Transaction)
+        .filter(
             Transaction.id == transaction_id,
             Transaction.user_id == current_user.id
         )
+        .with_for_update()
     )
     transaction = result.scalar_one_or_none()
     
@@ -262,41 +368,25 @@ async def update_transaction(
             detail="Transaction not found"
         )
     
-    # Get old amount and type for balance adjustment
-    old_amount = transaction.amount
-    old_type = transaction.transaction_type
-    old_account_id = transaction.account_id
+    # Revert the old effect and apply the new one, netted per account
+    effects = TransactionEffects(current_user.id)
+    effects.remove(transaction)
     
     # Update fields
     update_data = transaction_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(transaction, field, value)
     
-    # Adjust account balances
-    # Revert old transaction effect
-    old_account_result = await db.execute(
-        select(Account).filter(Account.id == old_account_id)
-    )
-    old_account = old_account_result.scalar_one()
-    
-    if old_type == TransactionType.INCOME:
-        old_account.balance -= old_amount
-    else:
-        old_account.balance += old_amount
-    
-    # Apply new transaction effect
-    new_account_result = await db.execute(
-        select(Account).filter(Account.id == transaction.account_id)
-    )
-    new_account = new_account_result.scalar_one()
-    
-    if transaction.transaction_type == TransactionType.INCOME:
-        new_account.balance += transaction.amount
-    else:
-        new_account.balance -= transaction.amount
+    effects.add(transaction)
+    if await effects.flush(db):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
     
-    await db.commit()
+    await db.flush()
     await db.refresh(transaction)
+    bump_user_data_version(db, current_user.id)
     
     return transaction
 
@@ -318,11 +408,14 @@ async def delete_transaction(
     Raises:
         HTTPException: If transaction not found or unauthorized
     """
+    # Lock the row so a concurrent delete waits, then finds nothing to revert
     result = await db.execute(
-        select(Transaction).filter(
+        select(Transaction)
+        .filter(
             Transaction.id == transaction_id,
             Transaction.user_id == current_user.id
         )
+        .with_for_update()
     )
     transaction = result.scalar_one_or_none()
     
@@ -332,73 +425,10 @@ async def delete_transaction(
             detail="Transaction not found"
         )
     
-    # Revert balance change
-    account_result = await db.execute(
-        select(Account).filter(Account.id == transaction.account_id)
-    )
-    account = account_result.scalar_one()
-    
-    if transaction.transaction_type == TransactionType.INCOME:
-        account.balance -= transaction.amount
-    else:
-        account.balance += transaction.amount
+    # Revert balance change and derived data
+    effects = TransactionEffects(current_user.id)
+    effects.remove(transaction)
+    await effects.flush(db)
     
     await db.delete(transaction)
-    await db.commit()
-
-
-@router.get("/export", response_model=Any)
-async def export_transactions(
-    format: str = Query(..., regex="^(csv|json)$"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """
-    Export transactions to CSV or JSON.
-    """
-    result = await db.execute(
-        select(Transaction)
-        .filter(Transaction.user_id == current_user.id)
-        .order_by(Transaction.transaction_date.desc())
-    )
-    transactions = result.scalars().all()
-
-    if format == 'json':
-        return [
-            {
-                "id": t.id,
-                "date": t.transaction_date.isoformat(),
-                "amount": float(t.amount),
-                "type": t.transaction_type,
-                "description": t.description,
-                "category_id": t.category_id,
-                "account_id": t.account_id
-            }
-            for t in transactions
-        ]
-    
-    # CSV Format
-    import csv
-    import io
-    from fastapi.responses import StreamingResponse
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Date', 'Amount', 'Type', 'Description', 'Category ID', 'Account ID'])
-    
-    for t in transactions:
-        writer.writerow([
-            t.transaction_date,
-            t.amount,
-            t.transaction_type,
-            t.description,
-            t.category_id,
-            t.account_id
-        ])
-    
-    output.seek(0)
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=transactions.csv"}
-    )
+    bump_user_data_version(db, current_user.id)
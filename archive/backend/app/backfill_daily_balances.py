@@ -0,0 +1,31 @@
+"""
+Rebuild the account_daily_balances snapshots from the transactions table.
+
+The snapshots are populated by the database migrations; run this whenever
+they are suspected to have drifted:
+
+    python -m app.backfill_daily_balances
+"""
+import asyncio
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.schema import check_schema_version
+from app.services.daily_balances import backfill_daily_balances
+
+
+async def main():
+    """Backfill daily balance snapshots in a single transaction."""
+    await check_schema_version(async_engine)
+    async with AsyncSessionLocal() as db:
+        try:
+            rows = await backfill_daily_balances(db)
+            await db.commit()
+            print(f"✓ Wrote {rows} daily balance snapshot rows.")
+        except Exception as e:
+            await db.rollback()
+            print(f"✗ Backfill failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
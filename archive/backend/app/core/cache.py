@@ -0,0 +1,382 @@
+import functools
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import after_commit, before_commit, dialect_insert, read_session
+from app.models.data_version import DataVersion
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after a fixed TTL.
+    
+    Not shared between worker processes.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+        
+        `ttl` overrides the cache's default lifetime for this entry.
+        """
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+GLOBAL_SCOPE = "global"
+
+
+def user_scope(user_id: int) -> str:
+    """Return the cache scope holding a user's data."""
+    return f"user:{user_id}"
+
+
+class ResponseCache:
+    """
+    Two-tier cache for JSON values such as read endpoint responses.
+    
+    The first tier is an in-process TTLCache; the optional second tier is
+    Redis, shared by all workers. Keys embed the versions of the scopes
+    they depend on. Writes bump a scope's version instead of deleting
+    entries, so stale entries are simply never looked up again.
+    
+    `versions` and `bump` keep versions in process memory, or in Redis when
+    enabled; they serve the identity cache. Response cache keys use the
+    data versions stored in the database (see `data_versions`).
+    """
+    
+    def __init__(self, maxsize: int, ttl: int, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+        self._redis = None
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0}
+    
+    def _client(self):
+        if self.redis_url and self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, socket_timeout=0.5)
+        return self._redis
+    
+    async def versions(self, *scopes: str) -> Tuple[int, ...]:
+        """Return the current version of each scope."""
+        client = self._client()
+        if client is not None:
+            try:
+                values = await client.mget([f"version:{scope}" for scope in scopes])
+                return tuple(int(value or 0) for value in values)
+            except Exception:
+                self.stats["redis_errors"] += 1
+        return tuple(self._versions.get(scope, 0) for scope in scopes)
+    
+    async def bump(self, scope: str) -> int:
+        """Invalidate everything cached for a scope and return its new version."""
+        version = self._versions.get(scope, 0) + 1
+        self._versions[scope] = version
+        client = self._client()
+        if client is not None:
+            try:
+                version = await client.incr(f"version:{scope}")
+            except Exception:
+                self.stats["redis_errors"] += 1
+        return version
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Return a cached response, or None on a miss in both tiers."""
+        value = self._local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+        
+        client = self._client()
+        if client is not None:
+            try:
+                raw = await client.get(f"response:{key}")
+            except Exception:
+                self.stats["redis_errors"] += 1
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._local.set(key, value)
+                self.stats["redis_hits"] += 1
+                return value
+        
+        self.stats["misses"] += 1
+        return None
+    
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-compatible response in both tiers."""
+        self._local.set(key, value)
+        client = self._client()
+        if client is not None:
+            try:
+                await client.set(f"response:{key}", json.dumps(value), ex=self.ttl)
+            except Exception:
+                self.stats["redis_errors"] += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier information."""
+        lookups = self.stats["local_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        hits = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "local_entries": len(self._local),
+            "redis_enabled": self.redis_url is not None,
+        }
+
+
+response_cache = ResponseCache(
+    maxsize=settings.CACHE_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL if settings.CACHE_REDIS_ENABLED else None
+)
+
+
+identity_cache = ResponseCache(
+    maxsize=settings.IDENTITY_CACHE_MAX_ENTRIES,
+    ttl=settings.IDENTITY_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL if settings.CACHE_REDIS_ENABLED else None
+)
+
+
+def identity_scope(user_id: int) -> str:
+    """Return the cache scope holding a user's identity."""
+    return f"identity:{user_id}"
+
+
+async def invalidate_user_identity(user_id: int) -> int:
+    """
+    Drop the cached identity of a user on every worker.
+    
+    Must be called after any change to the users row, such as a profile
+    update or deactivation.
+    
+    Args:
+        user_id: User whose row changed
+        
+    Returns:
+        int: The new identity version
+    """
+    return await identity_cache.bump(identity_scope(user_id))
+
+
+# Users who wrote recently and must read from the primary. Pins live in this
+# process and, when enabled, in Redis; workers that see neither compare the
+# user's data version on the replica with the primary instead.
+_primary_pins = TTLCache(maxsize=settings.CACHE_MAX_ENTRIES, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+async def pin_user_to_primary(user_id: int) -> None:
+    """Route a user's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    if not settings.DATABASE_READ_URL:
+        return
+    _primary_pins.set(user_id, True)
+    client = response_cache._client()
+    if client is not None:
+        try:
+            await client.set(f"primary:{user_id}", 1, ex=settings.READ_YOUR_WRITES_SECONDS)
+        except Exception:
+            response_cache.stats["redis_errors"] += 1
+
+
+async def is_pinned_to_primary(user_id: int) -> bool:
+    """
+    Return whether a user's reads must go to the primary database.
+    
+    True within the read-your-writes window after the user wrote through
+    this worker, or through any worker when Redis is enabled. Without a
+    shared pin, true while the replica has not yet replayed the user's
+    latest write, which costs a data version lookup on each database.
+    
+    Args:
+        user_id: User about to read
+        
+    Returns:
+        bool: True if the replica may miss the user's own writes
+    """
+    if not settings.DATABASE_READ_URL:
+        return False
+    if _primary_pins.get(user_id):
+        return True
+    client = response_cache._client()
+    if client is not None:
+        try:
+            return bool(await client.exists(f"primary:{user_id}"))
+        except Exception:
+            response_cache.stats["redis_errors"] += 1
+    async with read_session(use_primary=True) as primary, read_session() as replica:
+        return await user_data_version(replica, user_id) < await user_data_version(primary, user_id)
+
+
+async def data_versions(db: AsyncSession, *scopes: str) -> Tuple[int, ...]:
+    """
+    Return the committed data version of each scope.
+    
+    Versions are read once per session, so a request's ETag dependency and
+    its cached responses share one query. Reading them before the response
+    data means a write committed in between can only make the cached data
+    newer than its key, never older.
+    
+    Args:
+        db: Session the request reads its data from
+        *scopes: Cache scopes
+    
+    Returns:
+        tuple: Version per scope; 0 for scopes never written
+    """
+    known = db.info.setdefault("data_versions", {})
+    missing = [scope for scope in scopes if scope not in known]
+    if missing:
+        result = await db.execute(
+            select(DataVersion.scope, DataVersion.version).filter(DataVersion.scope.in_(missing))
+        )
+        known.update(dict.fromkeys(missing, 0))
+        known.update(dict(result.all()))
+    return tuple(known[scope] for scope in scopes)
+
+
+async def user_data_version(db: AsyncSession, user_id: int) -> int:
+    """Return the current data version of a user."""
+    (version,) = await data_versions(db, user_scope(user_id))
+    return version
+
+
+async def increment_data_versions(db: AsyncSession, scopes: Iterable[str]) -> None:
+    """
+    Add one to the data version of each scope in the session's transaction.
+    
+    Scopes are updated in sorted order so concurrent writers lock the
+    version rows in the same order.
+    
+    Args:
+        db: Session of the write
+        scopes: Cache scopes the write changed
+    """
+    for scope in sorted(scopes):
+        statement = dialect_insert(db)(DataVersion).values(scope=scope, version=1)
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[DataVersion.scope],
+            set_={"version": DataVersion.version + 1}
+        ))
+
+
+def _bump_on_commit(db: AsyncSession, scope: str) -> None:
+    # One increment per scope, however many times a request bumps it
+    scopes = db.info.get("bumped_scopes")
+    if scopes is None:
+        scopes = db.info["bumped_scopes"] = set()
+        before_commit(db, increment_data_versions, db, scopes)
+    scopes.add(scope)
+
+
+def bump_user_data_version(db: AsyncSession, user_id: int) -> None:
+    """
+    Invalidate everything cached for a user when the session commits.
+    
+    Called by every write to a user's transactions, accounts or budgets.
+    The version is incremented in the write's own transaction; after the
+    commit the user's reads are pinned to the primary database for a
+    short while.
+    
+    Args:
+        db: Session provided by get_db
+        user_id: User whose data changed
+    """
+    _bump_on_commit(db, user_scope(user_id))
+    after_commit(db, pin_user_to_primary, user_id)
+
+
+def bump_global_data_version(db: AsyncSession) -> None:
+    """Invalidate every cached response that depends on shared data (categories) when the session commits."""
+    _bump_on_commit(db, GLOBAL_SCOPE)
+
+
+def cached_response(namespace: str, response_type: Any = None):
+    """
+    Cache an endpoint's response per user and per data version.
+    
+    The wrapped endpoint keeps its signature, so FastAPI still resolves its
+    dependencies, and must have a `db` session parameter. The cache key is
+    built from the namespace, the current user (if the endpoint has a
+    `current_user` parameter), the user and global data versions, and the
+    remaining request parameters.
+    
+    Args:
+        namespace: Unique name of the endpoint
+        response_type: Type used to serialize ORM results (e.g. List[AccountResponse]);
+            plain dict/list results are stored as-is
+        
+    Returns:
+        Callable: Decorator
+    """
+    adapter = TypeAdapter(response_type) if response_type is not None else None
+    
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            current_user = kwargs.get("current_user")
+            scopes = (GLOBAL_SCOPE,) if current_user is None else (GLOBAL_SCOPE, user_scope(current_user.id))
+            versions = await data_versions(kwargs["db"], *scopes)
+            params = sorted(
+                (name, value) for name, value in kwargs.items()
+                if name not in ("current_user", "db")
+            )
+            digest = hashlib.sha1(repr(params).encode()).hexdigest()
+            key = f"{namespace}:{':'.join(scopes)}:{':'.join(map(str, versions))}:{digest}"
+            
+            cached = await response_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            result = await func(*args, **kwargs)
+            if adapter is not None:
+                value = adapter.dump_python(
+                    adapter.validate_python(result, from_attributes=True), mode="json"
+                )
+            else:
+                value = jsonable_encoder(result)
+            await response_cache.set(key, value)
+            return value
+        
+        return wrapper
+    
+    return decorator
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,6 +14,28 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_URL_SYNC: str
     
+    # Optional read replica for GET endpoints; users stay on the primary for
+    # READ_YOUR_WRITES_SECONDS after they write. Without Redis, other workers
+    # keep a user on the primary until the replica has the user's writes.
+    DATABASE_READ_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+    
+    # Connection pool of the async engine (not used for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # Seconds an SQLite writer waits for the write lock before the request
+    # fails with 503
+    SQLITE_BUSY_TIMEOUT: float = 30.0
+    
+    # Apply pending migrations on startup instead of only checking the schema
+    # version. For single-process development; deployments run
+    # `alembic upgrade head` once before starting workers.
+    DB_MIGRATE_ON_STARTUP: bool = False
+    
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -23,9 +45,24 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000", "http://127.0.0.1:5173", "http://127.0.0.1:3000"]
     
-    # Redis (for future use)
+    # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Response cache (in-process LRU, plus Redis when enabled)
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_REDIS_ENABLED: bool = False
+    
+    # Verified JWT payloads kept in memory; entries expire with the token
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Threads running bcrypt, i.e. concurrent password hashes/verifications per worker
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # Authenticated user identity cache (shares the Redis tier above)
+    IDENTITY_CACHE_TTL_SECONDS: int = 30
+    IDENTITY_CACHE_MAX_ENTRIES: int = 10000
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -1,16 +1,132 @@
-from sqlalchemy import create_engine
+import asyncio
+import contextlib
+import weakref
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base, sessionmaker
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Awaitable, Callable
 
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_engine
+from app.core.schema import upgrade_schema
+
+
+def pool_options(url: str) -> dict:
+    """
+    Return the create_async_engine pool arguments for a database URL.
+    
+    SQLite keeps SQLAlchemy's default pool, with writers waiting up to
+    SQLITE_BUSY_TIMEOUT seconds for the database lock.
+    
+    Args:
+        url: Database URL
+        
+    Returns:
+        dict: Pool keyword arguments
+    """
+    if url.startswith("sqlite"):
+        return {"connect_args": {"timeout": settings.SQLITE_BUSY_TIMEOUT}}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def use_sqlite_transactions(engine) -> None:
+    """
+    Make an SQLite engine start its transactions with an explicit BEGIN.
+    
+    The sqlite3 driver only opens a transaction at the first write, so the
+    reads before it see data that concurrent writers may change before this
+    transaction writes; SELECT ... FOR UPDATE is ignored on SQLite. Write
+    sessions therefore BEGIN IMMEDIATE: they take the write lock up front
+    and queue behind each other for the driver's busy timeout, instead of
+    reading first and failing when two of them upgrade at once. Read-only
+    engines (see `read_only_engine`) BEGIN DEFERRED so they don't block
+    writers. Other dialects are left unchanged.
+    
+    Args:
+        engine: AsyncEngine
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        mode = "DEFERRED" if conn.get_execution_options().get("sqlite_read_only") else "IMMEDIATE"
+        conn.exec_driver_sql(f"BEGIN {mode}")
+
+
+def read_only_engine(engine):
+    """
+    Return a variant of an engine for sessions that never write.
+    
+    Its transactions are READ ONLY on PostgreSQL and start with a deferred
+    BEGIN on SQLite.
+    
+    Args:
+        engine: AsyncEngine
+        
+    Returns:
+        AsyncEngine: Engine sharing the connection pool of `engine`
+    """
+    if engine.dialect.name == "postgresql":
+        return engine.execution_options(postgresql_readonly=True)
+    return engine.execution_options(sqlite_read_only=True)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Tell whether a database error only means the request lost a race.
+    
+    True for SQLite's "database is locked" after the busy timeout, and for
+    PostgreSQL serialization failures and deadlocks. The request can be
+    retried as is.
+    
+    Args:
+        error: Exception raised by SQLAlchemy
+        
+    Returns:
+        bool: True if retrying the request may succeed
+    """
+    if not isinstance(error, DBAPIError):
+        return False
+    code = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+    return code in ("40001", "40P01") or "database is locked" in str(error.orig)
+
 
 # Async engine for FastAPI endpoints
 async_engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    **pool_options(settings.DATABASE_URL)
 )
+instrument_engine(async_engine)
+use_sqlite_transactions(async_engine)
+
+# Async engine for read-only endpoints: the replica if configured, else the primary
+read_engine = async_engine
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        settings.DATABASE_READ_URL,
+        echo=settings.DEBUG,
+        future=True,
+        **pool_options(settings.DATABASE_READ_URL)
+    )
+    instrument_engine(read_engine)
+    use_sqlite_transactions(read_engine)
 
 # Sync engine for Alembic migrations
 sync_engine = create_engine(
@@ -28,6 +144,23 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+# Async session factories for read-only work, on the replica and on the
+# primary. They are never committed.
+ReadSessionLocal = async_sessionmaker(
+    read_only_engine(read_engine),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+PrimaryReadSessionLocal = async_sessionmaker(
+    read_only_engine(async_engine),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
 # Sync session factory for migrations
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -39,32 +172,148 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+# Per event loop queue of SQLite write sessions
+_sqlite_writers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def write_slot():
+    """
+    Return an async context manager to hold around a write session.
+    
+    SQLite takes one writer at a time and its waiting writers poll the lock
+    with growing sleeps, leaving it idle between commits. On SQLite the
+    write sessions of this process therefore wait their turn on a lock
+    instead, and only other processes contend through the busy timeout.
+    Other dialects run writers concurrently.
+    
+    Returns:
+        Async context manager
+    """
+    if async_engine.dialect.name != "sqlite":
+        return contextlib.nullcontext()
+    loop = asyncio.get_running_loop()
+    return _sqlite_writers.setdefault(loop, asyncio.Lock())
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency function to get database session.
+    Dependency function to get database session for writes.
+    
+    The session is committed exactly once, after the handler returns, and
+    rolled back if it raises. Handlers call `flush` when they need
+    generated values, and register work with `before_commit` and
+    `after_commit`.
     
     Yields:
         AsyncSession: Database session
     """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    async with write_slot():
+        async with AsyncSessionLocal() as session:
+            try:
+                yield session
+                for callback, args in session.info.pop("before_commit", []):
+                    await callback(*args)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+    
+    for callback, args in session.info.pop("after_commit", []):
+        await callback(*args)
 
 
-async def init_db():
-    """Initialize database tables."""
-    async with async_engine.begin() as conn:
-        # Import models to register them with Base
-        from app.models.user import User
-        from app.models.account import Account
-        from app.models.category import Category
-        from app.models.transaction import Transaction
-        from app.models.budget import Budget
+def before_commit(db: AsyncSession, callback: Callable[..., Awaitable[Any]], *args) -> None:
+    """
+    Run `callback(*args)` in the session's transaction, right before get_db commits it.
+    
+    Used for writes that the whole request contributes to, such as data
+    version bumps: they run once, last, and hold their row locks only
+    until the commit.
+    
+    Args:
+        db: Session provided by get_db
+        callback: Coroutine function to await
+        *args: Arguments for the callback
+    """
+    db.info.setdefault("before_commit", []).append((callback, args))
+
+
+def after_commit(db: AsyncSession, callback: Callable[..., Awaitable[Any]], *args) -> None:
+    """
+    Run `callback(*args)` once get_db has committed the session.
+    
+    Used for cache invalidation, which must not happen before the new data
+    is visible to other sessions.
+    
+    Args:
+        db: Session provided by get_db
+        callback: Coroutine function to await
+        *args: Arguments for the callback
+    """
+    db.info.setdefault("after_commit", []).append((callback, args))
+
+
+def read_session(use_primary: bool = False) -> AsyncSession:
+    """
+    Open a session for read-only work.
+    
+    Args:
+        use_primary: Read from the primary even when a replica is configured
+        
+    Returns:
+        AsyncSession: Session on the replica, or on the primary
+    """
+    return PrimaryReadSessionLocal() if use_primary else ReadSessionLocal()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get a read-only session on the read replica.
+    
+    The session is never committed; its transaction is simply closed.
+    For endpoints without a user; see `get_user_read_db` for per-user reads.
+    
+    Yields:
+        AsyncSession: Database session
+    """
+    async with read_session() as session:
+        yield session
+
+
+async def get_primary_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get a read-only session on the primary.
+    
+    For reads that must see every committed write, such as responses
+    cached under a data version that a write has just bumped. Like
+    `get_read_db`, the session is never committed.
+    
+    Yields:
+        AsyncSession: Database session
+    """
+    async with read_session(use_primary=True) as session:
+        yield session
+
+
+def dialect_insert(db: AsyncSession):
+    """
+    Return the dialect-specific insert() of a session, which supports upserts.
+    
+    Args:
+        db: Database session
         
-        await conn.run_sync(Base.metadata.create_all)
+    Returns:
+        Callable: postgresql.insert or sqlite.insert
+    """
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+async def init_db():
+    """Upgrade the database schema to the newest migration."""
+    await asyncio.to_thread(upgrade_schema)
@@ -0,0 +1,96 @@
+import hashlib
+from datetime import date
+from typing import Sequence
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import GLOBAL_SCOPE, data_versions, user_scope
+from app.core.database import get_primary_read_db
+from app.core.security import get_current_user, get_user_read_db
+
+
+def weak_etag(request: Request, scopes: Sequence[str], versions: Sequence[int]) -> str:
+    """
+    Build a weak ETag for a read request from the data versions it depends on.
+    
+    The scope names are part of the tag, so two users never get the same
+    tag for the same URL, even at equal versions. Today's date is included
+    because some responses default to the current month or day.
+    
+    Args:
+        request: Incoming request; its path and query string are part of the tag
+        scopes: Cache scopes the response depends on, e.g. the user's scope
+        versions: Data versions of those scopes
+    
+    Returns:
+        str: Weak ETag, e.g. W/"3f2a..."
+    """
+    source = (
+        f"{request.url.path}?{request.url.query}:{':'.join(scopes)}:"
+        f"{':'.join(map(str, versions))}:{date.today()}"
+    )
+    return f'W/"{hashlib.sha1(source.encode()).hexdigest()[:20]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/ prefixes are ignored
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in tags
+
+
+def _check(request: Request, response: Response, etag: str) -> None:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+
+async def user_etag(
+    request: Request,
+    response: Response,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_user_read_db)
+) -> None:
+    """
+    Answer 304 Not Modified when the client already has the current response.
+    
+    Used as a route dependency on per-user read endpoints. Runs before the
+    endpoint, so a matching If-None-Match skips its queries entirely. The
+    versions are read in the endpoint's session, which reuses them.
+    
+    Args:
+        request: Incoming request
+        response: Response whose ETag header is set
+        current_user: Current authenticated user
+        db: Session of the endpoint
+    
+    Raises:
+        HTTPException: 304 if If-None-Match matches the current ETag
+    """
+    scopes = (GLOBAL_SCOPE, user_scope(current_user.id))
+    versions = await data_versions(db, *scopes)
+    _check(request, response, weak_etag(request, scopes, versions))
+
+
+async def global_etag(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_primary_read_db)
+) -> None:
+    """
+    Answer 304 Not Modified for endpoints that only depend on shared data.
+    
+    Args:
+        request: Incoming request
+        response: Response whose ETag header is set
+        db: Session of the endpoint
+    
+    Raises:
+        HTTPException: 304 if If-None-Match matches the current ETag
+    """
+    scopes = (GLOBAL_SCOPE,)
+    versions = await data_versions(db, *scopes)
+    _check(request, response, weak_etag(request, scopes, versions))
@@ -0,0 +1,114 @@
+import bisect
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0]
+
+
+class PoolMetrics:
+    """Checkout wait histogram and counters of one connection pool."""
+    
+    def __init__(self):
+        self.wait_counts: List[int] = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_total = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+    
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+        self.wait_total += seconds
+    
+    def snapshot(self) -> Dict[str, Any]:
+        observed = sum(self.wait_counts)
+        histogram = {f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS, self.wait_counts)}
+        histogram["le_inf"] = self.wait_counts[-1]
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "wait_seconds_avg": self.wait_total / observed if observed else 0.0,
+            "wait_seconds_histogram": histogram
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+    
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - started)
+
+
+def instrument_engine(engine) -> None:
+    """
+    Attach connection event counters to an async engine's pool.
+    
+    Args:
+        engine: AsyncEngine created with InstrumentedQueuePool
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return
+    
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        engine.sync_engine.pool.metrics.checkouts += 1
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        engine.sync_engine.pool.metrics.connects += 1
+    
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        engine.sync_engine.pool.metrics.invalidations += 1
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """
+    Report the gauges, saturation and checkout metrics of an engine's pool.
+    
+    Args:
+        engine: AsyncEngine
+    
+    Returns:
+        dict: Pool status; only the pool class for non-queue pools
+    """
+    pool = engine.sync_engine.pool
+    status = {"pool": type(pool).__name__}
+    if not isinstance(pool, InstrumentedQueuePool):
+        return status
+    
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    in_use = pool.checkedout()
+    status.update({
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "in_use": in_use,
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "saturation": in_use / capacity if capacity else 0.0,
+        **pool.metrics.snapshot()
+    })
+    return status
@@ -0,0 +1,79 @@
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Directory holding alembic.ini and migrations/
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def alembic_config() -> Config:
+    """
+    Load the Alembic configuration independently of the working directory.
+    
+    Returns:
+        Config: alembic.ini with an absolute script location
+    """
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+
+def head_revision() -> str:
+    """Return the newest migration revision; only reads the migration scripts."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def current_revision(engine: AsyncEngine) -> Optional[str]:
+    """
+    Read the revision a database was last migrated to.
+    
+    Args:
+        engine: Database engine
+    
+    Returns:
+        Optional[str]: Revision, or None if the database was never migrated
+    """
+    async with engine.connect() as conn:
+        try:
+            return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except (OperationalError, ProgrammingError):
+            # No alembic_version table
+            return None
+
+
+async def check_schema_version(engine: AsyncEngine) -> None:
+    """
+    Verify that the database schema is at the newest migration.
+    
+    A single-row query, so it is cheap enough to run on every start and
+    takes no schema locks.
+    
+    Args:
+        engine: Database engine
+    
+    Raises:
+        RuntimeError: If the database is behind, ahead or was never migrated
+    """
+    expected = head_revision()
+    current = await current_revision(engine)
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at revision {current or '(none)'}, expected {expected}. "
+            "Run `alembic upgrade head` before starting the application."
+        )
+
+
+def upgrade_schema(revision: str = "head") -> None:
+    """
+    Apply pending migrations with the synchronous Alembic runner.
+    
+    Args:
+        revision: Target revision
+    """
+    command.upgrade(alembic_config(), revision)
@@ -1,14 +1,20 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import AsyncGenerator, Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import DateTime, select
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import read_session
+from app.core.cache import TTLCache, identity_cache, identity_scope, is_pinned_to_primary
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -16,6 +22,17 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# bcrypt takes ~250 ms per call and releases the GIL, so it runs in its own
+# bounded thread pool instead of blocking the event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+_password_jobs = {"pending": 0, "completed": 0}
+
+# Verified token payloads by token digest; each entry expires with its token
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_ENTRIES, ttl=0)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -44,6 +61,54 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_password_job(func, *args):
+    _password_jobs["pending"] += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_jobs["pending"] -= 1
+        _password_jobs["completed"] += 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the bcrypt thread pool without blocking the event loop.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+        
+    Returns:
+        bool: True if password matches
+    """
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password in the bcrypt thread pool without blocking the event loop.
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        str: Hashed password
+    """
+    return await _run_password_job(get_password_hash, password)
+
+
+def password_pool_stats() -> Dict[str, int]:
+    """Return the bcrypt pool size, jobs in flight, jobs waiting for a thread and jobs completed."""
+    workers = settings.PASSWORD_HASH_WORKERS
+    pending = _password_jobs["pending"]
+    return {
+        "workers": workers,
+        "pending": pending,
+        "queued": max(pending - workers, 0),
+        "completed": _password_jobs["completed"]
+    }
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -87,6 +152,9 @@ def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and verify a JWT token.
     
+    Successfully verified tokens are cached until their `exp`, so repeated
+    requests with the same token skip signature verification.
+    
     Args:
         token: JWT token to decode
         
@@ -96,8 +164,16 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(digest)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            _token_cache.set(digest, payload, ttl=expires_in)
         return payload
     except JWTError as e:
         print(f"DEBUG: JWT Decode Error: {e}")
@@ -108,16 +184,39 @@ def decode_token(token: str) -> Dict[str, Any]:
         )
 
 
+def _identity_snapshot(user) -> Dict[str, Any]:
+    # Every column except the password hash, as JSON
+    return jsonable_encoder({
+        column.name: getattr(user, column.name)
+        for column in user.__table__.columns
+        if column.name != "hashed_password"
+    })
+
+
+def _identity_user(snapshot: Dict[str, Any]):
+    from app.models.user import User
+    
+    values = dict(snapshot)
+    for column in User.__table__.columns:
+        if isinstance(column.type, DateTime) and values.get(column.name):
+            values[column.name] = datetime.fromisoformat(values[column.name])
+    return User(**values)
+
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
     Get current authenticated user from token.
     
+    The user row is cached for IDENTITY_CACHE_TTL_SECONDS. On a miss it is
+    read from the primary in a short read-only session that is never
+    committed, so read endpoints don't open a write session. The returned
+    User is not attached to any session; endpoints that modify the user
+    must load it with `db.get` and call `invalidate_user_identity`.
+    
     Args:
         credentials: HTTP Bearer credentials
-        db: Database session
         
     Returns:
         User: Current authenticated user
@@ -149,8 +248,15 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    result = await db.execute(select(User).filter(User.id == user_id))
-    user = result.scalar_one_or_none()
+    (version,) = await identity_cache.versions(identity_scope(user_id))
+    cache_key = f"{identity_scope(user_id)}:{version}"
+    snapshot = await identity_cache.get(cache_key)
+    if snapshot is not None:
+        return _identity_user(snapshot)
+    
+    async with read_session(use_primary=True) as db:
+        result = await db.execute(select(User).filter(User.id == user_id))
+        user = result.scalar_one_or_none()
     
     if user is None:
         raise HTTPException(
@@ -159,4 +265,23 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    await identity_cache.set(cache_key, _identity_snapshot(user))
     return user
+
+
+async def get_user_read_db(current_user=Depends(get_current_user)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get a read-only session for the current user.
+    
+    Uses the read replica, unless the user's latest writes may be missing
+    from it (see `is_pinned_to_primary`), in which case it uses the primary
+    so the user sees their own writes.
+    
+    Args:
+        current_user: Current authenticated user
+        
+    Yields:
+        AsyncSession: Database session
+    """
+    async with read_session(await is_pinned_to_primary(current_user.id)) as session:
+        yield session
@@ -0,0 +1,39 @@
+"""
+Evaluate budget thresholds for all users and record alerts.
+
+Run nightly (or continuously as a worker); an interrupted run resumes from
+its last committed batch:
+
+    python -m app.evaluate_budgets                # one pass
+    python -m app.evaluate_budgets --every 3600   # a pass every hour
+"""
+import argparse
+import asyncio
+
+from app.core.database import async_engine
+from app.core.schema import check_schema_version
+from app.services.budget_alerts import EVALUATOR_BATCH_SIZE, run_evaluator
+
+
+async def main(every: int = 0, batch_size: int = EVALUATOR_BATCH_SIZE):
+    """Run the budget evaluator once, or forever every `every` seconds."""
+    await check_schema_version(async_engine)
+    while True:
+        try:
+            batches = await run_evaluator(batch_size=batch_size)
+            print(f"✓ Evaluated budgets in {batches} batches.")
+        except Exception as e:
+            print(f"✗ Budget evaluation failed: {e}")
+            if not every:
+                raise
+        if not every:
+            return
+        await asyncio.sleep(every)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--every", type=int, default=0, help="Seconds between passes (default: run once)")
+    parser.add_argument("--batch-size", type=int, default=EVALUATOR_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.every, args.batch_size))
@@ -2,6 +2,6 @@ import asyncio
 from app.core.database import init_db
 
 if __name__ == "__main__":
-    print("Creating database tables...")
+    print("Applying database migrations...")
     asyncio.run(init_db())
-    print("Tables created successfully.")
+    print("Database schema is up to date.")
@@ -4,7 +4,12 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, async_engine, is_retryable_error, read_engine
+from app.core.schema import check_schema_version
+from app.core.pool_metrics import pool_status
+from app.core.cache import identity_cache, response_cache
+from app.core.security import password_pool_stats
+from app.services.search import detect_search_index
 from app.api.v1.api import api_router
 
 # Create FastAPI application
@@ -23,13 +28,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
 # Global exception handlers
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-    """Handle SQLAlchemy database errors."""
+    """Handle SQLAlchemy database errors; lost write races can be retried."""
+    if is_retryable_error(exc):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Database busy, retry the request"},
+            headers={"Retry-After": "1"}
+        )
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Database error occurred"}
@@ -49,32 +61,12 @@ async def general_exception_handler(request: Request, exc: Exception):
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
-    # Uncomment to create tables on startup (for development)
-    await init_db()
+    # Schema changes are applied by migrations, not on every boot
+    if settings.DB_MIGRATE_ON_STARTUP:
+        await init_db()
+    await check_schema_version(async_engine)
+    await detect_search_index(async_engine)
     
-    # Auto-migration for currency column
-    try:
-        from sqlalchemy import text, inspect
-        from app.core.database import async_engine
-        
-        def check_currency_column(connection):
-            inspector = inspect(connection)
-            columns = [c['name'] for c in inspector.get_columns('users')]
-            return 'currency' in columns
-
-        async with async_engine.connect() as conn:
-            # Check if column exists using sync inspector
-            has_currency = await conn.run_sync(check_currency_column)
-            
-            if not has_currency:
-                print("Migrating: Adding currency column to users table...")
-                # SQLite syntax compatible
-                await conn.execute(text("ALTER TABLE users ADD COLUMN currency VARCHAR DEFAULT 'USD'"))
-                await conn.commit()
-                print("Migration successful: currency column added.")
-    except Exception as e:
-        print(f"Migration warning: {e}")
-
     print(f"🚀 {settings.APP_NAME} started successfully!")
     print(f"📚 API Documentation: http://localhost:8000/docs")
 
@@ -92,6 +84,27 @@ async def health_check():
     return {"status": "healthy", "app": settings.APP_NAME}
 
 
+@app.get("/health/cache")
+async def cache_stats():
+    """Response and identity cache hit/miss counters for this worker."""
+    return {"responses": response_cache.snapshot(), "identities": identity_cache.snapshot()}
+
+
+@app.get("/health/db")
+async def database_pool_stats():
+    """Connection pool saturation and checkout wait times for this worker."""
+    pools = pool_status(async_engine)
+    if read_engine is not async_engine:
+        pools["replica"] = pool_status(read_engine)
+    return pools
+
+
+@app.get("/health/password-hashing")
+async def password_hashing_stats():
+    """bcrypt thread pool size and queue depth for this worker."""
+    return password_pool_stats()
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Date
+
+from app.core.database import Base
+
+
+class AccountDailyBalance(Base):
+    """
+    Net balance change of an account per day, maintained by transaction writes.
+    
+    The balance at the end of day D is the current account balance minus
+    the net changes of all days after D.
+    """
+    
+    __tablename__ = "account_daily_balances"
+    
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    net_change = Column(Numeric(precision=12, scale=2), default=0.00, nullable=False)
+    
+    def __repr__(self):
+        return f"<AccountDailyBalance {self.account_id} {self.day} {self.net_change}>"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -9,6 +9,10 @@ class Budget(Base):
     """Budget model for monthly budgeting."""
     
     __tablename__ = "budgets"
+    __table_args__ = (
+        # Budget lists and spent_amount maintenance look budgets up by user and month
+        Index("ix_budgets_user_month", "user_id", "month"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -38,7 +42,7 @@ class BudgetCategory(Base):
     spent_amount = Column(Numeric(precision=12, scale=2), default=0.00, nullable=False)
     
     # Foreign Keys
-    budget_id = Column(Integer, ForeignKey("budgets.id"), nullable=False)
+    budget_id = Column(Integer, ForeignKey("budgets.id"), nullable=False, index=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     
     # Relationships
@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, ForeignKey, Index
+
+from app.core.database import Base
+
+
+class BudgetAlert(Base):
+    """
+    A change of a budget allocation's threshold status.
+    
+    Written by the budget evaluator worker; the latest alert of an
+    allocation holds its last known status.
+    """
+    
+    __tablename__ = "budget_alerts"
+    __table_args__ = (
+        Index("ix_budget_alerts_user_id_id", "user_id", "id"),
+        Index("ix_budget_alerts_budget_category_id_id", "budget_category_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    budget_id = Column(Integer, ForeignKey("budgets.id", ondelete="CASCADE"), nullable=False)
+    budget_category_id = Column(Integer, ForeignKey("budget_categories.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, nullable=False)
+    month = Column(Date, nullable=False)
+    previous_status = Column(String, nullable=True)
+    status = Column(String, nullable=False)
+    percentage = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<BudgetAlert {self.budget_category_id} {self.previous_status} -> {self.status}>"
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String
+
+from app.core.database import Base
+
+
+class DataVersion(Base):
+    """
+    Version of a cache scope (a user's data, or shared data such as categories).
+    
+    Incremented in the same database transaction as every write to the
+    scope, so cache keys and ETags built from it are valid across worker
+    processes and restarts.
+    """
+    
+    __tablename__ = "data_versions"
+    
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<DataVersion {self.scope} at {self.version}>"
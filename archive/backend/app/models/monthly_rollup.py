@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Date, Enum as SQLEnum
+
+from app.core.database import Base
+from app.models.transaction import TransactionType
+
+# category_id stored for transactions without a category
+UNCATEGORIZED = 0
+
+
+class MonthlyRollup(Base):
+    """
+    Sum and count of a user's transactions per month, category and type.
+    
+    Maintained by the transaction write paths in the same database
+    transaction as the write itself.
+    """
+    
+    __tablename__ = "monthly_rollups"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    # Not a foreign key: UNCATEGORIZED has no categories row
+    category_id = Column(Integer, primary_key=True, default=UNCATEGORIZED)
+    transaction_type = Column(SQLEnum(TransactionType), primary_key=True)
+    total = Column(Numeric(precision=14, scale=2), default=0.00, nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<MonthlyRollup {self.user_id} {self.month} {self.category_id} {self.transaction_type}>"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Enum as SQLEnum, Date
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Enum as SQLEnum, Date, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -16,6 +16,10 @@ class Transaction(Base):
     """Transaction model for income and expenses."""
     
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Serves both offset and keyset pagination of a user's history
+        Index("ix_transactions_user_date_created_id", "user_id", "transaction_date", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Numeric(precision=12, scale=2), nullable=False)
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import Column, Date, Integer, String, DateTime
+
+from app.core.database import Base
+
+
+class WorkerCheckpoint(Base):
+    """Resume position of a batch worker, committed after every batch."""
+    
+    __tablename__ = "worker_checkpoints"
+    
+    name = Column(String, primary_key=True)
+    # Last processed key; 0 when no run is in progress
+    position = Column(Integer, default=0, nullable=False)
+    # Month the position belongs to, for workers that run once per month
+    month = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<WorkerCheckpoint {self.name} at {self.position}>"
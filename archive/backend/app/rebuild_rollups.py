@@ -0,0 +1,40 @@
+"""
+Verify the monthly_rollups table against transactions and repair drift.
+
+    python -m app.rebuild_rollups            # repair drifted rollups
+    python -m app.rebuild_rollups --verify   # only report drift
+"""
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.schema import check_schema_version
+from app.services.rollups import find_rollup_drift, repair_rollups
+
+
+async def main(verify_only: bool = False):
+    """Check (and optionally repair) monthly rollups in a single transaction."""
+    await check_schema_version(async_engine)
+    async with AsyncSessionLocal() as db:
+        try:
+            if verify_only:
+                drift = await find_rollup_drift(db)
+                for (user_id, month, category_id, transaction_type), (total, count) in sorted(
+                    drift.items(), key=lambda item: (item[0][0], item[0][1], item[0][2])
+                ):
+                    print(f"  user={user_id} month={month} category={category_id} "
+                          f"type={transaction_type.value}: total {total:+} count {count:+}")
+                print(f"{'✗' if drift else '✓'} {len(drift)} drifted rollup rows.")
+                return
+            
+            repaired = await repair_rollups(db)
+            await db.commit()
+            print(f"✓ Repaired {repaired} rollup rows.")
+        except Exception as e:
+            await db.rollback()
+            print(f"✗ Rollup rebuild failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    asyncio.run(main(verify_only="--verify" in sys.argv[1:]))
@@ -0,0 +1,37 @@
+"""
+Verify budget_categories.spent_amount against transactions and repair drift.
+
+    python -m app.reconcile_budgets            # repair drifted allocations
+    python -m app.reconcile_budgets --verify   # only report drift
+"""
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.schema import check_schema_version
+from app.services.budgets import find_spent_drift, repair_spent
+
+
+async def main(verify_only: bool = False):
+    """Check (and optionally repair) budget spending in a single transaction."""
+    await check_schema_version(async_engine)
+    async with AsyncSessionLocal() as db:
+        try:
+            if verify_only:
+                drift = await find_spent_drift(db)
+                for allocation_id, (stored, expected) in sorted(drift.items()):
+                    print(f"  budget_category={allocation_id}: stored {stored} expected {expected}")
+                print(f"{'✗' if drift else '✓'} {len(drift)} drifted budget allocations.")
+                return
+            
+            repaired = await repair_spent(db)
+            await db.commit()
+            print(f"✓ Repaired {repaired} budget allocations.")
+        except Exception as e:
+            await db.rollback()
+            print(f"✗ Budget reconciliation failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    asyncio.run(main(verify_only="--verify" in sys.argv[1:]))
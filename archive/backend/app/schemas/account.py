@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional
 from decimal import Decimal
 from pydantic import BaseModel, Field
@@ -49,3 +49,9 @@ class AccountSummary(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class BalanceHistoryPoint(BaseModel):
+    """Schema for an account's closing balance at a point in time."""
+    date: date
+    balance: Decimal
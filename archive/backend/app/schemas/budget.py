@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from decimal import Decimal
 
@@ -48,3 +48,17 @@ class BudgetWithProgress(BudgetResponse):
 
     class Config:
         from_attributes = True
+
+
+class BudgetAlertResponse(BaseModel):
+    id: int
+    budget_id: int
+    category_id: int
+    month: date
+    previous_status: Optional[str] = None
+    status: str
+    percentage: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
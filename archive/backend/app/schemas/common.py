@@ -1,17 +1,28 @@
 from typing import Generic, TypeVar, List, Optional
 from pydantic import BaseModel
+import enum
 
 
 T = TypeVar("T")
 
 
+class CountStrategy(str, enum.Enum):
+    """How the total of a paginated listing is computed."""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    SKIPPED = "skipped"
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response schema."""
     items: List[T]
-    total: int
+    total: Optional[int]
     page: int
     size: int
-    pages: int
+    pages: Optional[int]
+    count_strategy: CountStrategy = CountStrategy.EXACT
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 class MessageResponse(BaseModel):
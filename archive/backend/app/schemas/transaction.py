@@ -1,14 +1,17 @@
 from datetime import datetime, date
-from typing import Optional
+from typing import Annotated, List, Optional
 from decimal import Decimal
 from pydantic import BaseModel, Field
 
 from app.models.transaction import TransactionType
 
+# Positive and within the Numeric(12, 2) column; NaN and infinities are rejected
+Amount = Annotated[Decimal, Field(gt=0, max_digits=12, decimal_places=2)]
+
 
 class TransactionBase(BaseModel):
     """Base transaction schema."""
-    amount: Decimal = Field(..., gt=0)
+    amount: Amount
     transaction_type: TransactionType
     description: str = Field(..., min_length=1, max_length=255)
     transaction_date: date
@@ -23,7 +26,7 @@ class TransactionCreate(TransactionBase):
 
 class TransactionUpdate(BaseModel):
     """Schema for transaction update."""
-    amount: Optional[Decimal] = Field(None, gt=0)
+    amount: Optional[Amount] = None
     transaction_type: Optional[TransactionType] = None
     description: Optional[str] = Field(None, min_length=1, max_length=255)
     transaction_date: Optional[date] = None
@@ -62,3 +65,17 @@ class TransactionFilter(BaseModel):
     account_id: Optional[int] = None
     min_amount: Optional[Decimal] = None
     max_amount: Optional[Decimal] = None
+
+
+class TransactionImportError(BaseModel):
+    """Schema for a row rejected during import."""
+    # 0 when the whole file could not be read
+    row: int
+    error: str
+
+
+class TransactionImportResult(BaseModel):
+    """Schema for the outcome of a bulk transaction import."""
+    imported: int = 0
+    failed: int = 0
+    errors: List[TransactionImportError] = []
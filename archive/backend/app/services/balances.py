@@ -0,0 +1,46 @@
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account
+from app.models.transaction import TransactionType
+
+
+def signed_amount(amount: Decimal, transaction_type: TransactionType) -> Decimal:
+    """Return the effect of a transaction on its account balance."""
+    return amount if transaction_type == TransactionType.INCOME else -amount
+
+
+async def adjust_balance(
+    db: AsyncSession,
+    account_id: int,
+    delta: Decimal,
+    user_id: Optional[int] = None
+) -> bool:
+    """
+    Atomically add `delta` to an account balance in the database.
+    
+    The change is a single `UPDATE ... SET balance = balance + :delta`, so
+    concurrent writers never overwrite each other's changes.
+    
+    Args:
+        db: Database session
+        account_id: Account to adjust
+        delta: Signed amount to add
+        user_id: When given, the account must belong to this user
+        
+    Returns:
+        bool: True if the account was found and updated
+    """
+    statement = (
+        update(Account)
+        .where(Account.id == account_id)
+        .values(balance=Account.balance + delta)
+        .execution_options(synchronize_session=False)
+    )
+    if user_id is not None:
+        statement = statement.where(Account.user_id == user_id)
+    result = await db.execute(statement)
+    return result.rowcount > 0
@@ -0,0 +1,143 @@
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.models.budget import Budget, BudgetCategory
+from app.models.budget_alert import BudgetAlert
+from app.models.user import User
+from app.models.worker_checkpoint import WorkerCheckpoint
+from app.services.budgets import budget_status
+from app.services.rollups import month_start
+from app.services.timeseries import next_bucket
+
+CHECKPOINT_NAME = "budget_evaluator"
+
+# Users evaluated per batch (and per database transaction)
+EVALUATOR_BATCH_SIZE = 1000
+
+
+async def _latest_statuses(db: AsyncSession, allocation_ids: List[int]) -> Dict[int, str]:
+    latest = (
+        select(func.max(BudgetAlert.id))
+        .filter(BudgetAlert.budget_category_id.in_(allocation_ids))
+        .group_by(BudgetAlert.budget_category_id)
+    )
+    result = await db.execute(
+        select(BudgetAlert.budget_category_id, BudgetAlert.status)
+        .filter(BudgetAlert.id.in_(latest))
+    )
+    return dict(result.all())
+
+
+async def evaluate_batch(db: AsyncSession, after_user_id: int, month: date, batch_size: int = EVALUATOR_BATCH_SIZE) -> Optional[int]:
+    """
+    Evaluate the budgets of the next batch of users and record status changes.
+    
+    Allocations without a previous alert are recorded only when they are
+    not on track, so healthy budgets never produce alerts.
+    
+    Args:
+        db: Database session
+        after_user_id: Evaluate users with a greater id
+        month: First day of the month whose budgets are evaluated
+        batch_size: Number of users per batch
+    
+    Returns:
+        Optional[int]: Id of the last user evaluated, or None when no users remain
+    """
+    result = await db.execute(
+        select(User.id)
+        .filter(User.id > after_user_id)
+        .order_by(User.id)
+        .limit(batch_size)
+    )
+    user_ids = result.scalars().all()
+    if not user_ids:
+        return None
+    
+    result = await db.execute(
+        select(
+            BudgetCategory.id,
+            BudgetCategory.budget_id,
+            BudgetCategory.category_id,
+            BudgetCategory.allocated_amount,
+            BudgetCategory.spent_amount,
+            Budget.user_id
+        )
+        .join(Budget, Budget.id == BudgetCategory.budget_id)
+        .filter(
+            Budget.user_id.between(user_ids[0], user_ids[-1]),
+            Budget.month >= month,
+            Budget.month < next_bucket(month, "month")
+        )
+    )
+    allocations = result.all()
+    previous = await _latest_statuses(db, [row.id for row in allocations]) if allocations else {}
+    
+    alerts = []
+    for row in allocations:
+        percentage = float(row.spent_amount / row.allocated_amount * 100) if row.allocated_amount > 0 else 0.0
+        status = budget_status(percentage)
+        if status == previous.get(row.id, "on_track"):
+            continue
+        alerts.append({
+            "user_id": row.user_id,
+            "budget_id": row.budget_id,
+            "budget_category_id": row.id,
+            "category_id": row.category_id,
+            "month": month,
+            "previous_status": previous.get(row.id),
+            "status": status,
+            "percentage": percentage
+        })
+    if alerts:
+        await db.execute(BudgetAlert.__table__.insert(), alerts)
+    
+    return user_ids[-1]
+
+
+async def _save_checkpoint(db: AsyncSession, month: date, position: int) -> None:
+    statement = dialect_insert(db)(WorkerCheckpoint).values(name=CHECKPOINT_NAME, month=month, position=position)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[WorkerCheckpoint.name],
+        set_={
+            "month": statement.excluded.month,
+            "position": statement.excluded.position,
+            "updated_at": func.now()
+        }
+    ))
+
+
+async def run_evaluator(month: Optional[date] = None, batch_size: int = EVALUATOR_BATCH_SIZE) -> int:
+    """
+    Evaluate every user's budgets for a month, resuming an interrupted run.
+    
+    Each batch is committed together with the checkpoint, so a crash loses
+    at most one batch of work and memory stays bounded by the batch size.
+    A checkpoint left by an unfinished run for another month is ignored.
+    
+    Args:
+        month: Month to evaluate (defaults to the current month)
+        batch_size: Number of users per batch
+    
+    Returns:
+        int: Number of batches evaluated
+    """
+    month = month_start(month or date.today())
+    async with AsyncSessionLocal() as db:
+        checkpoint = await db.get(WorkerCheckpoint, CHECKPOINT_NAME)
+        position = checkpoint.position if checkpoint and checkpoint.month == month else 0
+    
+    batches = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            last_user_id = await evaluate_batch(db, position, month, batch_size)
+            await _save_checkpoint(db, month, last_user_id or 0)
+            await db.commit()
+        if last_user_id is None:
+            return batches
+        position = last_user_id
+        batches += 1
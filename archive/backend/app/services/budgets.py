@@ -0,0 +1,224 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.budget import Budget, BudgetCategory
+from app.models.category import Category
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction, TransactionType
+from app.schemas.budget import BudgetWithProgress
+from app.services.timeseries import bucket_expression, next_bucket
+
+# (user_id, month start, category_id)
+SpentKey = Tuple[int, date, int]
+
+# Percentage of the allocation at which a budget is flagged
+WARNING_PERCENTAGE = 80
+EXCEEDED_PERCENTAGE = 100
+
+
+def budget_status(percentage: float) -> str:
+    """Return on_track, warning or exceeded for a spent percentage."""
+    if percentage >= EXCEEDED_PERCENTAGE:
+        return "exceeded"
+    if percentage >= WARNING_PERCENTAGE:
+        return "warning"
+    return "on_track"
+
+
+def progress_query(user_id: int, budget_id: Optional[int] = None):
+    """
+    Select every allocation of a user's budgets with its category name.
+    
+    Spending is read from the maintained BudgetCategory.spent_amount.
+    
+    Args:
+        user_id: Owner of the budgets
+        budget_id: Restrict to a single budget
+        
+    Returns:
+        Select: Rows of (Budget, BudgetCategory or None, category name)
+    """
+    query = (
+        select(Budget, BudgetCategory, Category.name)
+        .outerjoin(BudgetCategory, BudgetCategory.budget_id == Budget.id)
+        .outerjoin(Category, Category.id == BudgetCategory.category_id)
+        .filter(Budget.user_id == user_id)
+        .order_by(Budget.month.desc(), Budget.id, BudgetCategory.id)
+    )
+    if budget_id is not None:
+        query = query.filter(Budget.id == budget_id)
+    return query
+
+
+def to_progress(budget: Budget, allocation: BudgetCategory, category_name: Optional[str]) -> BudgetWithProgress:
+    """Build the progress response of one budget allocation."""
+    spent = allocation.spent_amount
+    allocated = allocation.allocated_amount
+    percentage = float((spent / allocated * 100)) if allocated > 0 else 0.0
+    
+    return BudgetWithProgress(
+        id=budget.id,
+        category_id=allocation.category_id,
+        amount=allocated,
+        period="monthly",
+        start_date=datetime.combine(budget.month, datetime.min.time()),
+        end_date=None,
+        user_id=budget.user_id,
+        category_name=category_name,
+        created_at=budget.created_at,
+        updated_at=budget.updated_at,
+        spent=spent,
+        remaining=allocated - spent,
+        percentage=percentage,
+        status=budget_status(percentage)
+    )
+
+
+async def budget_progress(db: AsyncSession, user_id: int, budget_id: Optional[int] = None) -> List[BudgetWithProgress]:
+    """
+    Compute the progress of a user's budgets in a single query.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the budgets
+        budget_id: Restrict to a single budget
+    
+    Returns:
+        List[BudgetWithProgress]: One entry per allocation, newest month first.
+        A budget without allocations yields no entry.
+    """
+    result = await db.execute(progress_query(user_id, budget_id))
+    return [
+        to_progress(budget, allocation, category_name)
+        for budget, allocation, category_name in result
+        if allocation is not None
+    ]
+
+
+def _month_budgets(user_id: int, month: date):
+    # Budgets whose month falls in the calendar month starting at `month`.
+    # A budget counts every expense of its calendar month, also when its
+    # start date is mid-month; spending used to be counted from the start date.
+    return select(Budget.id).filter(
+        Budget.user_id == user_id,
+        Budget.month >= month,
+        Budget.month < next_bucket(month, "month")
+    )
+
+
+async def apply_spent_changes(db: AsyncSession, changes: Dict[SpentKey, Decimal]) -> None:
+    """
+    Add expense deltas to the spent_amount of the matching budget allocations.
+    
+    One UPDATE per (user, month, category), in key order so concurrent
+    writers lock rows in the same order.
+    
+    Args:
+        db: Database session
+        changes: Expense total delta per (user_id, month start, category_id)
+    """
+    for (user_id, month, category_id), delta in sorted(changes.items()):
+        if not delta:
+            continue
+        await db.execute(
+            update(BudgetCategory)
+            .where(
+                BudgetCategory.category_id == category_id,
+                BudgetCategory.budget_id.in_(_month_budgets(user_id, month))
+            )
+            .values(spent_amount=BudgetCategory.spent_amount + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def current_spent(db: AsyncSession, user_id: int, month: date, category_id: int) -> Decimal:
+    """
+    Return a user's expenses in a category for a month, from the monthly rollups.
+    
+    Used to initialize spent_amount when an allocation is created. Covers
+    the whole calendar month, even for a budget starting mid-month (spending
+    used to be counted from the budget's start date).
+    
+    Args:
+        db: Database session
+        user_id: Owner of the transactions
+        month: First day of the month
+        category_id: Category ID
+        
+    Returns:
+        Decimal: Total spent
+    """
+    result = await db.execute(
+        select(MonthlyRollup.total)
+        .filter(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.month == month,
+            MonthlyRollup.category_id == category_id,
+            MonthlyRollup.transaction_type == TransactionType.EXPENSE
+        )
+    )
+    return result.scalar() or Decimal("0.00")
+
+
+async def find_spent_drift(db: AsyncSession) -> Dict[int, Tuple[Decimal, Decimal]]:
+    """
+    Compare every stored spent_amount against the transactions table.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        dict: (stored, expected) per drifted BudgetCategory id
+    """
+    dialect = db.bind.dialect.name
+    expected = func.coalesce(func.sum(Transaction.amount), 0)
+    result = await db.stream(
+        select(BudgetCategory.id, BudgetCategory.spent_amount, expected)
+        .join(Budget, Budget.id == BudgetCategory.budget_id)
+        .outerjoin(Transaction, and_(
+            Transaction.user_id == Budget.user_id,
+            Transaction.category_id == BudgetCategory.category_id,
+            Transaction.transaction_type == TransactionType.EXPENSE,
+            bucket_expression(Transaction.transaction_date, "month", dialect)
+            == bucket_expression(Budget.month, "month", dialect)
+        ))
+        .group_by(BudgetCategory.id, BudgetCategory.spent_amount)
+    )
+    drift = {}
+    async for allocation_id, stored, total in result:
+        total = Decimal(total).quantize(Decimal("0.01"))
+        if stored != total:
+            drift[allocation_id] = (stored, total)
+    return drift
+
+
+async def repair_spent(db: AsyncSession) -> int:
+    """
+    Correct every drifted spent_amount from the transactions table.
+    
+    Stored and expected values come from one query, and each correction
+    only applies while spent_amount still holds the stored value, so an
+    expense written concurrently is never counted twice or lost. Allocations
+    skipped that way are fixed by the next run.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        int: Number of allocations corrected
+    """
+    repaired = 0
+    drift = await find_spent_drift(db)
+    for allocation_id, (stored, expected) in sorted(drift.items()):
+        result = await db.execute(
+            update(BudgetCategory)
+            .where(BudgetCategory.id == allocation_id, BudgetCategory.spent_amount == stored)
+            .values(spent_amount=BudgetCategory.spent_amount + (expected - stored))
+            .execution_options(synchronize_session=False)
+        )
+        repaired += result.rowcount
+    return repaired
@@ -0,0 +1,82 @@
+import json
+from typing import Hashable, Optional, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.cache import TTLCache, user_data_version
+from app.schemas.common import CountStrategy
+
+# Keys include the user's data version, so transaction writes invalidate
+# cached counts
+_count_cache = TTLCache(maxsize=50_000, ttl=60)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the inner query's bind parameters."""
+    
+    inherit_cache = False
+    
+    def __init__(self, query: Select):
+        self.query = query
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kw)
+
+
+async def _exact_count(db: AsyncSession, query: Select) -> int:
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    return result.scalar() or 0
+
+
+async def _planner_estimate(db: AsyncSession, query: Select) -> int:
+    result = await db.execute(_Explain(query))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    strategy: CountStrategy,
+    user_id: int,
+    filter_key: Hashable
+) -> Tuple[Optional[int], CountStrategy]:
+    """
+    Count the rows matched by a filtered listing query.
+    
+    Estimated counts come from the planner's row estimate on Postgres. Other
+    databases serve them from the per-user count cache, filling it with an
+    exact count on a miss.
+    
+    Args:
+        db: Database session
+        query: Filtered query without ordering or limits
+        strategy: Requested count strategy
+        user_id: Owner of the rows, used to scope the cache
+        filter_key: Hashable description of the active filters
+        
+    Returns:
+        tuple: (total or None when skipped, strategy actually used)
+    """
+    if strategy == CountStrategy.SKIPPED:
+        return None, CountStrategy.SKIPPED
+    
+    if strategy == CountStrategy.EXACT:
+        return await _exact_count(db, query), CountStrategy.EXACT
+    
+    if db.bind.dialect.name == "postgresql":
+        return await _planner_estimate(db, query), CountStrategy.ESTIMATED
+    
+    cache_key = (user_id, await user_data_version(db, user_id), filter_key)
+    total = _count_cache.get(cache_key)
+    if total is None:
+        total = await _exact_count(db, query)
+        _count_cache.set(cache_key, total)
+    return total, CountStrategy.ESTIMATED
@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.models.account_daily_balance import AccountDailyBalance
+from app.models.transaction import Transaction, TransactionType
+
+
+async def record_daily_changes(db: AsyncSession, changes: Dict[Tuple[int, date], Decimal]) -> None:
+    """
+    Add net changes to the daily snapshot rows, creating them as needed.
+    
+    Args:
+        db: Database session
+        changes: Net change per (account_id, day)
+    """
+    rows = [
+        {"account_id": account_id, "day": day, "net_change": delta}
+        for (account_id, day), delta in sorted(changes.items())
+        if delta
+    ]
+    if not rows:
+        return
+    
+    statement = dialect_insert(db)(AccountDailyBalance)
+    statement = statement.on_conflict_do_update(
+        index_elements=[AccountDailyBalance.account_id, AccountDailyBalance.day],
+        set_={"net_change": AccountDailyBalance.net_change + statement.excluded.net_change}
+    )
+    await db.execute(statement, rows)
+
+
+async def backfill_daily_balances(db: AsyncSession) -> int:
+    """
+    Rebuild every daily snapshot row from the transactions table.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        int: Number of snapshot rows written
+    """
+    signed = case(
+        (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+        else_=-Transaction.amount
+    )
+    await db.execute(delete(AccountDailyBalance))
+    result = await db.execute(
+        insert(AccountDailyBalance).from_select(
+            ["account_id", "day", "net_change"],
+            select(Transaction.account_id, Transaction.transaction_date, func.sum(signed))
+            .group_by(Transaction.account_id, Transaction.transaction_date)
+        )
+    )
+    return result.rowcount
+
+
+def _period_end(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day + timedelta(days=6 - day.weekday())
+    if granularity == "month":
+        next_month = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+        return next_month - timedelta(days=1)
+    return day
+
+
+async def balance_history(
+    db: AsyncSession,
+    account_id: int,
+    current_balance: Decimal,
+    start: date,
+    end: date,
+    granularity: str = "day"
+) -> List[Dict]:
+    """
+    Compute closing balances of an account over a date range.
+    
+    Uses one aggregate over snapshots after `end` and one scan of the
+    snapshots inside the range, so the cost grows with the number of days
+    rather than the number of transactions.
+    
+    Args:
+        db: Database session
+        account_id: Account ID
+        current_balance: Current balance of the account
+        start: First day of the range
+        end: Last day of the range
+        granularity: "day", "week" or "month"
+        
+    Returns:
+        List[dict]: {"date", "balance"} per period, closing balance at the
+        period end (or at `end` for the last, partial period)
+    """
+    later_result = await db.execute(
+        select(func.sum(AccountDailyBalance.net_change))
+        .filter(AccountDailyBalance.account_id == account_id, AccountDailyBalance.day > end)
+    )
+    balance = current_balance - (later_result.scalar() or Decimal("0.00"))
+    
+    changes_result = await db.execute(
+        select(AccountDailyBalance.day, AccountDailyBalance.net_change)
+        .filter(
+            AccountDailyBalance.account_id == account_id,
+            AccountDailyBalance.day >= start,
+            AccountDailyBalance.day <= end
+        )
+    )
+    changes = dict(changes_result.all())
+    
+    # Walk backwards from the end, undoing each day's change
+    closing = {}
+    day = end
+    while day >= start:
+        closing[day] = balance
+        balance -= changes.get(day, Decimal("0.00"))
+        day -= timedelta(days=1)
+    
+    history = []
+    period_end = _period_end(start, granularity)
+    while True:
+        point = min(period_end, end)
+        history.append({"date": point, "balance": closing[point]})
+        if point >= end:
+            break
+        period_end = _period_end(point + timedelta(days=1), granularity)
+    return history
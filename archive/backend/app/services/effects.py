@@ -0,0 +1,89 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.monthly_rollup import UNCATEGORIZED
+from app.models.transaction import TransactionType
+from app.services.balances import adjust_balance, signed_amount
+from app.services.budgets import apply_spent_changes
+from app.services.daily_balances import record_daily_changes
+from app.services.rollups import RollupKey, apply_rollup_changes, rollup_key
+
+
+class TransactionEffects:
+    """
+    Accumulates the derived-data changes caused by a user's transaction writes.
+    
+    Covers account balances, daily balance snapshots, monthly rollups and
+    the spent_amount of budget allocations.
+    Changes are netted in memory and applied with a single `flush` in the
+    caller's database transaction.
+    
+    `add` and `remove` accept any object with the transaction fields
+    (account_id, amount, transaction_type, transaction_date, category_id),
+    such as a Transaction row or a TransactionCreate schema.
+    """
+    
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self._balances: Dict[int, Decimal] = defaultdict(lambda: Decimal("0.00"))
+        self._daily: Dict[Tuple[int, date], Decimal] = defaultdict(lambda: Decimal("0.00"))
+        self._rollups: Dict[RollupKey, Tuple[Decimal, int]] = defaultdict(lambda: (Decimal("0.00"), 0))
+    
+    def _apply(self, transaction, sign: int) -> None:
+        delta = signed_amount(transaction.amount, transaction.transaction_type) * sign
+        self._balances[transaction.account_id] += delta
+        self._daily[(transaction.account_id, transaction.transaction_date)] += delta
+        
+        key = rollup_key(
+            self.user_id,
+            transaction.category_id,
+            transaction.transaction_type,
+            transaction.transaction_date
+        )
+        total, count = self._rollups[key]
+        self._rollups[key] = (total + transaction.amount * sign, count + sign)
+    
+    def add(self, transaction) -> None:
+        """Record the effects of a new (or updated) transaction."""
+        self._apply(transaction, 1)
+    
+    def remove(self, transaction) -> None:
+        """Record the reversal of an existing transaction's effects."""
+        self._apply(transaction, -1)
+    
+    async def flush(self, db: AsyncSession) -> List[int]:
+        """
+        Apply all accumulated changes.
+        
+        Balances are updated first, one UPDATE per account in id order, and
+        only on accounts owned by the user. If any account is missing,
+        nothing else is written and the caller is expected to roll back.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            List[int]: Accounts with a non-zero delta that matched no row
+        """
+        missing = []
+        for account_id, delta in sorted(self._balances.items()):
+            if delta and not await adjust_balance(db, account_id, delta, self.user_id):
+                missing.append(account_id)
+        
+        if not missing:
+            await record_daily_changes(db, self._daily)
+            await apply_rollup_changes(db, self._rollups)
+            await apply_spent_changes(db, {
+                (user_id, month, category_id): total
+                for (user_id, month, category_id, transaction_type), (total, count) in self._rollups.items()
+                if transaction_type == TransactionType.EXPENSE and category_id != UNCATEGORIZED
+            })
+        
+        self._balances.clear()
+        self._daily.clear()
+        self._rollups.clear()
+        return missing
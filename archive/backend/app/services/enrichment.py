@@ -0,0 +1,47 @@
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Select
+
+from app.models.transaction import Transaction
+from app.models.account import Account
+from app.models.category import Category
+from app.schemas.transaction import TransactionWithDetails
+
+
+def with_details(query: Select) -> Select:
+    """
+    Extend a transaction query so each row also carries account and category names.
+    
+    Args:
+        query: Select over Transaction
+        
+    Returns:
+        Select: Query yielding (Transaction, account_name, category_name) rows
+    """
+    return (
+        query
+        .add_columns(Account.name.label("account_name"), Category.name.label("category_name"))
+        .outerjoin(Account, Account.id == Transaction.account_id)
+        .outerjoin(Category, Category.id == Transaction.category_id)
+    )
+
+
+def to_details(
+    rows: Iterable[Tuple[Transaction, Optional[str], Optional[str]]]
+) -> List[TransactionWithDetails]:
+    """
+    Map rows produced by `with_details` into response schemas in a single pass.
+    
+    Args:
+        rows: (Transaction, account_name, category_name) rows
+        
+    Returns:
+        List[TransactionWithDetails]: Enriched transactions
+    """
+    details = []
+    for transaction, account_name, category_name in rows:
+        item = TransactionWithDetails.model_validate(transaction)
+        item.account_name = account_name
+        item.category_name = category_name
+        details.append(item)
+    return details
@@ -0,0 +1,238 @@
+import csv
+import importlib.util
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import Row, Select, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.transaction import Transaction
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_CHUNK_SIZE = 1000
+
+# Exportable fields, in output order
+EXPORT_FIELDS = {
+    "id": Transaction.id,
+    "date": Transaction.transaction_date,
+    "amount": Transaction.amount,
+    "type": Transaction.transaction_type,
+    "description": Transaction.description,
+    "category_id": Transaction.category_id,
+    "account_id": Transaction.account_id,
+}
+
+CSV_HEADERS = {
+    "id": "ID",
+    "date": "Date",
+    "amount": "Amount",
+    "type": "Type",
+    "description": "Description",
+    "category_id": "Category ID",
+    "account_id": "Account ID",
+}
+
+# CSV exports have never included the transaction id
+DEFAULT_CSV_FIELDS = [name for name in EXPORT_FIELDS if name != "id"]
+
+
+def export_query(
+    user_id: int,
+    fields: Sequence[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Select:
+    """
+    Select the requested fields of a user's transactions, newest first.
+    
+    Args:
+        user_id: Owner of the transactions
+        fields: Names from EXPORT_FIELDS
+        start_date: Optional inclusive lower bound on transaction_date
+        end_date: Optional inclusive upper bound on transaction_date
+    
+    Returns:
+        Select: Export query whose row keys are the field names
+    """
+    query = (
+        select(*(EXPORT_FIELDS[name].label(name) for name in fields))
+        .filter(Transaction.user_id == user_id)
+    )
+    if start_date:
+        query = query.filter(Transaction.transaction_date >= start_date)
+    if end_date:
+        query = query.filter(Transaction.transaction_date <= end_date)
+    return query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+
+
+async def iter_export_chunks(query: Select, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the rows of an export query in fixed-size chunks.
+    
+    Uses its own session because the response body is produced after the
+    request's dependencies have been closed.
+    
+    Args:
+        query: Export query
+        chunk_size: Rows per chunk
+    
+    Yields:
+        Sequence[Row]: Up to `chunk_size` rows
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+
+def _plain(name: str, value):
+    if value is None:
+        return None
+    if name == "date":
+        return value.isoformat()
+    if name == "amount":
+        return float(value)
+    if name == "type":
+        return value.value
+    return value
+
+
+def _json_record(row: Row, fields: Sequence[str]) -> dict:
+    mapping = row._mapping
+    return {name: _plain(name, mapping[name]) for name in fields}
+
+
+async def stream_csv(query: Select, fields: Sequence[str]) -> AsyncIterator[str]:
+    """Emit CSV text one chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([CSV_HEADERS[name] for name in fields])
+    yield buffer.getvalue()
+    
+    async for rows in iter_export_chunks(query):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([
+                value.value if name == "type" else value
+                for name, value in zip(fields, row)
+            ])
+        yield buffer.getvalue()
+
+
+async def stream_ndjson(query: Select, fields: Sequence[str]) -> AsyncIterator[str]:
+    """Emit one JSON object per line."""
+    async for rows in iter_export_chunks(query):
+        yield "".join(json.dumps(_json_record(row, fields)) + "\n" for row in rows)
+
+
+async def stream_json(query: Select, fields: Sequence[str]) -> AsyncIterator[str]:
+    """Emit a JSON array incrementally, without materializing it."""
+    yield "["
+    first = True
+    async for rows in iter_export_chunks(query):
+        records = ",".join(json.dumps(_json_record(row, fields)) for row in rows)
+        if not records:
+            continue
+        yield records if first else "," + records
+        first = False
+    yield "]"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the generator."""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema(fields: Sequence[str]):
+    import pyarrow as pa
+    
+    types = {
+        "id": pa.int64(),
+        "date": pa.date32(),
+        # Matches Numeric(precision=12, scale=2) on Transaction.amount
+        "amount": pa.decimal128(12, 2),
+        "type": pa.dictionary(pa.int8(), pa.string()),
+        "description": pa.string(),
+        "category_id": pa.int64(),
+        "account_id": pa.int64(),
+    }
+    return pa.schema([(name, types[name]) for name in fields])
+
+
+def _record_batch(rows: Sequence[Row], schema):
+    import pyarrow as pa
+    
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if field.name == "type":
+            values = [value.value for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+async def _stream_columnar(query: Select, fields: Sequence[str], open_writer) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    
+    schema = _arrow_schema(fields)
+    sink = _ChunkSink()
+    writer = open_writer(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        async for rows in iter_export_chunks(query):
+            writer.write_batch(_record_batch(rows, schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def stream_parquet(query: Select, fields: Sequence[str]) -> AsyncIterator[bytes]:
+    """Emit a Parquet file, one row group per fetched chunk."""
+    import pyarrow.parquet as pq
+    
+    async for data in _stream_columnar(query, fields, pq.ParquetWriter):
+        yield data
+
+
+async def stream_arrow(query: Select, fields: Sequence[str]) -> AsyncIterator[bytes]:
+    """Emit an Arrow IPC stream, one record batch per fetched chunk."""
+    import pyarrow as pa
+    
+    async for data in _stream_columnar(query, fields, pa.ipc.new_stream):
+        yield data
+
+
+def format_available(format: str) -> bool:
+    """Return whether the optional dependency behind an export format is installed."""
+    if format in ("parquet", "arrow"):
+        return importlib.util.find_spec("pyarrow") is not None
+    return True
+
+
+# format -> (stream function, media type, file extension)
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv", "csv"),
+    "json": (stream_json, "application/json", "json"),
+    "ndjson": (stream_ndjson, "application/x-ndjson", "ndjson"),
+    "parquet": (stream_parquet, "application/vnd.apache.parquet", "parquet"),
+    "arrow": (stream_arrow, "application/vnd.apache.arrow.stream", "arrows"),
+}
@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import increment_data_versions, user_scope
+from app.models.account import Account
+from app.models.category import Category
+from app.models.transaction import Transaction, TransactionType
+from app.schemas.transaction import (
+    TransactionCreate,
+    TransactionImportError,
+    TransactionImportResult
+)
+from app.services.effects import TransactionEffects
+
+# Rows inserted per executemany batch (and per commit)
+IMPORT_BATCH_SIZE = 500
+
+# Only the first errors are returned; the rest are just counted
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_FORMATS = ("csv", "ofx", "jsonl")
+
+# Accepted column names, including the headers written by the CSV export
+FIELD_ALIASES = {
+    "date": "transaction_date",
+    "type": "transaction_type",
+    "category": "category_id",
+    "account": "account_id",
+}
+
+RawRow = Tuple[int, Dict[str, Any]]
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Guess the import format from an uploaded file name."""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("ofx", "qfx"):
+        return "ofx"
+    if extension in ("json", "jsonl", "ndjson"):
+        return "jsonl"
+    return None
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[RawRow]:
+    """Yield (line number, row) pairs from a CSV file with a header row."""
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline=""))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield reader.line_num, {"__error__": f"Invalid CSV: {e}"}
+            continue
+        yield reader.line_num, row
+
+
+def iter_jsonl_rows(file: BinaryIO) -> Iterator[RawRow]:
+    """
+    Yield (line number, row) pairs from JSON lines.
+    
+    A file holding a single JSON array (as written by the JSON export) is
+    also accepted, but has to be parsed in one piece; if it is malformed a
+    single error for row 0 (the whole file) is yielded.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace")
+    first_line = text.readline()
+    if first_line.lstrip().startswith("["):
+        try:
+            records = json.loads(first_line + text.read())
+        except ValueError as e:
+            yield 0, {"__error__": f"Invalid JSON: {e}"}
+            return
+        for index, record in enumerate(records, start=1):
+            yield index, _check_record(record)
+        return
+    
+    if first_line.strip():
+        yield 1, _load_json_line(first_line)
+    for line_number, line in enumerate(text, start=2):
+        if line.strip():
+            yield line_number, _load_json_line(line)
+
+
+def _check_record(record: Any) -> Dict[str, Any]:
+    if not isinstance(record, dict):
+        return {"__error__": "Expected a JSON object"}
+    return record
+
+
+def _load_json_line(line: str) -> Dict[str, Any]:
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return {"__error__": f"Invalid JSON: {e}"}
+    return _check_record(record)
+
+
+_OFX_TAG = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+def iter_ofx_rows(file: BinaryIO) -> Iterator[RawRow]:
+    """Yield (statement entry number, row) pairs from an OFX/QFX statement."""
+    text = io.TextIOWrapper(file, encoding="utf-8", errors="replace")
+    entry: Optional[Dict[str, str]] = None
+    number = 0
+    
+    for line in text:
+        for tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                entry = {}
+            elif entry is not None and value.strip():
+                entry[tag] = value.strip()
+        if entry is not None and "</STMTTRN>" in line.upper():
+            number += 1
+            yield number, _ofx_to_row(entry)
+            entry = None
+
+
+def _ofx_to_row(entry: Dict[str, str]) -> Dict[str, Any]:
+    posted = entry.get("DTPOSTED", "")
+    return {
+        "transaction_date": f"{posted[0:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 else posted,
+        "amount": entry.get("TRNAMT"),
+        "description": entry.get("NAME") or entry.get("MEMO"),
+        "notes": entry.get("MEMO") if entry.get("NAME") else None,
+    }
+
+
+ROW_READERS = {
+    "csv": iter_csv_rows,
+    "ofx": iter_ofx_rows,
+    "jsonl": iter_jsonl_rows,
+}
+
+
+def _normalize(raw: Dict[str, Any], default_account_id: Optional[int]) -> Dict[str, Any]:
+    """Map a raw row onto TransactionCreate fields."""
+    data = {}
+    for key, value in raw.items():
+        if key is None:
+            continue
+        name = key.strip().lower().replace(" ", "_")
+        name = FIELD_ALIASES.get(name, name)
+        data[name] = None if value == "" else value
+    data.pop("id", None)
+    
+    if data.get("account_id") is None:
+        data["account_id"] = default_account_id
+    
+    # Signed amounts (bank statements) imply the transaction type
+    amount = data.get("amount")
+    if amount is not None:
+        try:
+            amount = Decimal(str(amount))
+        except InvalidOperation:
+            return data
+        if not amount.is_finite():
+            # Left for validation to reject; NaN cannot be compared
+            return data
+        if data.get("transaction_type") is None:
+            data["transaction_type"] = TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+        data["amount"] = abs(amount)
+    
+    if isinstance(data.get("transaction_type"), str):
+        data["transaction_type"] = data["transaction_type"].strip().lower()
+    return data
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+async def import_transactions(
+    db: AsyncSession,
+    user_id: int,
+    rows: Iterator[RawRow],
+    default_account_id: Optional[int] = None
+) -> TransactionImportResult:
+    """
+    Validate and insert transactions in batches.
+    
+    Rows are consumed lazily from `rows`. Each batch is written with one
+    executemany INSERT, one balance UPDATE per affected account, batched
+    snapshot and rollup upserts, a data version bump, and one commit.
+    Invalid rows are reported and skipped.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the imported transactions
+        rows: (row number, raw row) pairs from one of ROW_READERS
+        default_account_id: Account for rows that do not name one
+        
+    Returns:
+        TransactionImportResult: Counts and per-row errors
+    """
+    account_result = await db.execute(select(Account.id).filter(Account.user_id == user_id))
+    account_ids = set(account_result.scalars().all())
+    category_result = await db.execute(select(Category.id))
+    category_ids = set(category_result.scalars().all())
+    
+    result = TransactionImportResult()
+    batch: List[Dict[str, Any]] = []
+    effects = TransactionEffects(user_id)
+    
+    def reject(row_number: int, message: str) -> None:
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(TransactionImportError(row=row_number, error=message))
+    
+    async def flush() -> None:
+        if not batch:
+            return
+        await db.execute(insert(Transaction), batch)
+        await effects.flush(db)
+        await increment_data_versions(db, [user_scope(user_id)])
+        await db.commit()
+        result.imported += len(batch)
+        batch.clear()
+    
+    for row_number, raw in rows:
+        if "__error__" in raw:
+            reject(row_number, raw["__error__"])
+            continue
+        try:
+            transaction = TransactionCreate.model_validate(_normalize(raw, default_account_id))
+        except ValidationError as e:
+            reject(row_number, _describe(e))
+            continue
+        
+        if transaction.account_id not in account_ids:
+            reject(row_number, "Account not found")
+            continue
+        if transaction.category_id is not None and transaction.category_id not in category_ids:
+            reject(row_number, "Category not found")
+            continue
+        
+        batch.append({**transaction.model_dump(), "user_id": user_id})
+        effects.add(transaction)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush()
+    
+    await flush()
+    return result
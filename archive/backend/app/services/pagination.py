@@ -0,0 +1,133 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transaction import Transaction
+
+
+# Sort key shared by offset and keyset pagination; matches
+# the ix_transactions_user_date_created_id index.
+TRANSACTION_ORDER = (
+    Transaction.transaction_date.desc(),
+    Transaction.created_at.desc(),
+    Transaction.id.desc()
+)
+
+NEXT = "next"
+PREV = "prev"
+
+
+def encode_cursor(transaction: Transaction, direction: str) -> str:
+    """
+    Build an opaque cursor from a transaction's sort key.
+    
+    Args:
+        transaction: Boundary transaction of the current page
+        direction: NEXT or PREV
+        
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = [
+        transaction.transaction_date.isoformat(),
+        transaction.created_at.isoformat(),
+        transaction.id,
+        direction
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Tuple[date, datetime, int], str]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    
+    Args:
+        cursor: Cursor token
+        
+    Returns:
+        tuple: ((transaction_date, created_at, id), direction)
+        
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_created, transaction_id, direction = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        key = (
+            date.fromisoformat(raw_date),
+            datetime.fromisoformat(raw_created),
+            int(transaction_id)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return key, direction
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    cursor: str,
+    size: int
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    Fetch one page of `query` positioned by a keyset cursor.
+    
+    The query must select Transaction as its first entity. An empty cursor
+    returns the first page. Each page is a bounded index range scan, so its
+    cost does not depend on how deep into the history it is.
+    
+    Args:
+        db: Database session
+        query: Filtered transaction query without ordering or limits
+        cursor: Cursor from a previous response, or "" for the first page
+        size: Page size
+        
+    Returns:
+        tuple: (rows, next_cursor, prev_cursor)
+    """
+    sort_key = tuple_(Transaction.transaction_date, Transaction.created_at, Transaction.id)
+    direction = NEXT
+    
+    if cursor:
+        key, direction = decode_cursor(cursor)
+        if direction == NEXT:
+            query = query.filter(sort_key < key)
+        else:
+            query = query.filter(sort_key > key)
+    
+    if direction == NEXT:
+        query = query.order_by(*TRANSACTION_ORDER)
+    else:
+        query = query.order_by(*(column.element.asc() for column in TRANSACTION_ORDER))
+    
+    # Fetch one extra row to learn whether another page exists
+    result = await db.execute(query.limit(size + 1))
+    rows = list(result.all())
+    has_more = len(rows) > size
+    rows = rows[:size]
+    
+    if direction == PREV:
+        rows.reverse()
+        has_next, has_prev = bool(cursor), has_more
+    else:
+        has_next, has_prev = has_more, bool(cursor)
+    
+    if not rows:
+        return rows, None, None
+    
+    next_cursor = encode_cursor(rows[-1][0], NEXT) if has_next else None
+    prev_cursor = encode_cursor(rows[0][0], PREV) if has_prev else None
+    return rows, next_cursor, prev_cursor
@@ -0,0 +1,233 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.models.monthly_rollup import MonthlyRollup, UNCATEGORIZED
+from app.models.transaction import Transaction, TransactionType
+
+RollupKey = Tuple[int, date, int, TransactionType]
+
+
+def month_start(day: date) -> date:
+    """Return the first day of the month containing `day`."""
+    return day.replace(day=1)
+
+
+def rollup_key(user_id: int, category_id, transaction_type: TransactionType, day: date) -> RollupKey:
+    return (user_id, month_start(day), category_id or UNCATEGORIZED, transaction_type)
+
+
+def _key_order(key: RollupKey):
+    # Rows are written in key order so concurrent writers lock them in the same order
+    return key[:3] + (key[3].value,)
+
+
+async def apply_rollup_changes(db: AsyncSession, changes: Dict[RollupKey, Tuple[Decimal, int]]) -> None:
+    """
+    Add (total, count) changes to the monthly rollups, creating rows as needed.
+    
+    Args:
+        db: Database session
+        changes: (total delta, count delta) per rollup key
+    """
+    rows = [
+        {
+            "user_id": user_id,
+            "month": month,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+            "total": total,
+            "count": count
+        }
+        for (user_id, month, category_id, transaction_type), (total, count) in sorted(
+            changes.items(), key=lambda item: _key_order(item[0])
+        )
+        if total or count
+    ]
+    if not rows:
+        return
+    
+    statement = dialect_insert(db)(MonthlyRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            MonthlyRollup.user_id,
+            MonthlyRollup.month,
+            MonthlyRollup.category_id,
+            MonthlyRollup.transaction_type
+        ],
+        set_={
+            "total": MonthlyRollup.total + statement.excluded.total,
+            "count": MonthlyRollup.count + statement.excluded.count
+        }
+    )
+    await db.execute(statement, rows)
+
+
+async def move_category_rollups(db: AsyncSession, category_id: int) -> None:
+    """
+    Move every rollup of a category to UNCATEGORIZED.
+    
+    Used when a category is deleted and its transactions lose their
+    category_id.
+    
+    Args:
+        db: Database session
+        category_id: Category being deleted
+    """
+    result = await db.execute(
+        select(
+            MonthlyRollup.user_id,
+            MonthlyRollup.month,
+            MonthlyRollup.transaction_type,
+            MonthlyRollup.total,
+            MonthlyRollup.count
+        )
+        .filter(MonthlyRollup.category_id == category_id)
+        .with_for_update()
+    )
+    changes = {
+        (user_id, month, UNCATEGORIZED, transaction_type): (total, count)
+        for user_id, month, transaction_type, total, count in result
+    }
+    await db.execute(delete(MonthlyRollup).where(MonthlyRollup.category_id == category_id))
+    await apply_rollup_changes(db, changes)
+
+
+async def expected_rollups(db: AsyncSession) -> Dict[RollupKey, Tuple[Decimal, int]]:
+    """
+    Aggregate the transactions table into rollup rows.
+    
+    Transactions are grouped per day in SQL and folded into months in
+    Python, which avoids dialect-specific month truncation.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        dict: (total, count) per rollup key
+    """
+    result = await db.stream(
+        select(
+            Transaction.user_id,
+            Transaction.category_id,
+            Transaction.transaction_type,
+            Transaction.transaction_date,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        )
+        .group_by(
+            Transaction.user_id,
+            Transaction.category_id,
+            Transaction.transaction_type,
+            Transaction.transaction_date
+        )
+    )
+    expected = defaultdict(lambda: (Decimal("0.00"), 0))
+    async for user_id, category_id, transaction_type, day, total, count in result:
+        key = rollup_key(user_id, category_id, transaction_type, day)
+        current_total, current_count = expected[key]
+        expected[key] = (current_total + total, current_count + count)
+    return dict(expected)
+
+
+async def _rollup_drift(db: AsyncSession) -> Dict[RollupKey, Tuple[Optional[Tuple[Decimal, int]], Tuple[Decimal, int]]]:
+    # Stored rows are read before the transactions, so a write committed
+    # between the two reads has also changed a stored row since it was read,
+    # which the guard in repair_rollups detects
+    result = await db.execute(select(MonthlyRollup))
+    stored = {
+        (row.user_id, row.month, row.category_id, row.transaction_type): (row.total, row.count)
+        for row in result.scalars()
+    }
+    expected = await expected_rollups(db)
+    
+    drift = {}
+    for key in expected.keys() | stored.keys():
+        expected_values = expected.get(key, (Decimal("0.00"), 0))
+        if stored.get(key) != expected_values:
+            drift[key] = (stored.get(key), expected_values)
+    return drift
+
+
+async def find_rollup_drift(db: AsyncSession) -> Dict[RollupKey, Tuple[Decimal, int]]:
+    """
+    Compare stored rollups against the transactions table.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        dict: (total, count) correction per drifted rollup key
+    """
+    drift = {}
+    for key, (stored, (expected_total, expected_count)) in (await _rollup_drift(db)).items():
+        stored_total, stored_count = stored or (Decimal("0.00"), 0)
+        drift[key] = (expected_total - stored_total, expected_count - stored_count)
+    return drift
+
+
+async def repair_rollups(db: AsyncSession) -> int:
+    """
+    Apply corrections for every drifted rollup and drop empty rows.
+    
+    Each correction only applies while the row still holds the value it
+    was computed from, so a transaction written concurrently is never
+    counted twice or lost. Rows skipped that way are fixed by the next run.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        int: Number of rollup rows corrected
+    """
+    repaired = 0
+    drift = await _rollup_drift(db)
+    for key in sorted(drift, key=_key_order):
+        user_id, month, category_id, transaction_type = key
+        stored, (expected_total, expected_count) = drift[key]
+        if stored is None:
+            # A concurrent write that created the row wins
+            statement = (
+                dialect_insert(db)(MonthlyRollup)
+                .values(
+                    user_id=user_id,
+                    month=month,
+                    category_id=category_id,
+                    transaction_type=transaction_type,
+                    total=expected_total,
+                    count=expected_count
+                )
+                .on_conflict_do_nothing(index_elements=[
+                    MonthlyRollup.user_id,
+                    MonthlyRollup.month,
+                    MonthlyRollup.category_id,
+                    MonthlyRollup.transaction_type
+                ])
+            )
+        else:
+            stored_total, stored_count = stored
+            statement = (
+                update(MonthlyRollup)
+                .where(
+                    MonthlyRollup.user_id == user_id,
+                    MonthlyRollup.month == month,
+                    MonthlyRollup.category_id == category_id,
+                    MonthlyRollup.transaction_type == transaction_type,
+                    MonthlyRollup.total == stored_total,
+                    MonthlyRollup.count == stored_count
+                )
+                .values(
+                    total=MonthlyRollup.total + (expected_total - stored_total),
+                    count=MonthlyRollup.count + (expected_count - stored_count)
+                )
+                .execution_options(synchronize_session=False)
+            )
+        result = await db.execute(statement)
+        repaired += result.rowcount
+    await db.execute(delete(MonthlyRollup).where(MonthlyRollup.count == 0))
+    return repaired
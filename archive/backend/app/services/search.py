@@ -0,0 +1,93 @@
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Select, or_, text, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import ColumnElement, column, table
+
+from app.models.transaction import Transaction
+
+# Name of the active search backend ("postgresql", "sqlite") or None when
+# no index is available and searches fall back to ILIKE scans.
+_search_backend: Optional[str] = None
+
+_fts = table("transactions_fts", column("rowid"), column("rank"))
+
+# Catalog query per dialect telling whether the search index created by
+# the full text search migration exists
+SEARCH_INDEX_QUERIES = {
+    "postgresql": "SELECT to_regclass('ix_transactions_search') IS NOT NULL",
+    "sqlite": "SELECT count(*) FROM sqlite_master WHERE name = 'transactions_fts'",
+}
+
+
+async def detect_search_index(engine: AsyncEngine) -> None:
+    """
+    Enable indexed search if the full-text search index exists.
+    
+    The index is created by a migration; this only runs one catalog query.
+    Without the index (e.g. SQLite built without FTS5) `apply_search`
+    keeps using ILIKE.
+    
+    Args:
+        engine: Database engine
+    """
+    global _search_backend
+    dialect = engine.dialect.name
+    query = SEARCH_INDEX_QUERIES.get(dialect)
+    if query is None:
+        return
+    
+    async with engine.connect() as conn:
+        available = await conn.scalar(text(query))
+    if not available:
+        print("Search index unavailable, using ILIKE fallback")
+    _search_backend = dialect if available else None
+
+
+def _terms(search: str) -> list:
+    return re.findall(r"\w+", search)
+
+
+def apply_search(query: Select, search: str) -> Tuple[Select, Optional[ColumnElement]]:
+    """
+    Filter a transaction query by a search term over description and notes.
+    
+    Every word of the term is matched as a prefix against the search index.
+    Without an index the previous substring ILIKE filter is used.
+    
+    Args:
+        query: Select over Transaction
+        search: Raw search term
+        
+    Returns:
+        tuple: (filtered query, ordering clause by relevance or None)
+    """
+    terms = _terms(search)
+    
+    if _search_backend == "postgresql" and terms:
+        vector = literal_column("transactions.search_vector")
+        ts_query = func.to_tsquery(
+            literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms)
+        )
+        query = query.filter(vector.op("@@")(ts_query))
+        return query, func.ts_rank(vector, ts_query).desc()
+    
+    if _search_backend == "sqlite" and terms:
+        match = " ".join('"{}"*'.format(term) for term in terms)
+        query = (
+            query
+            .join(_fts, _fts.c.rowid == Transaction.id)
+            .filter(literal_column("transactions_fts").op("MATCH")(match))
+        )
+        # FTS5 bm25 rank: lower is more relevant
+        return query, _fts.c.rank.asc()
+    
+    search_term = f"%{search}%"
+    query = query.filter(
+        or_(
+            Transaction.description.ilike(search_term),
+            Transaction.notes.ilike(search_term)
+        )
+    )
+    return query, None
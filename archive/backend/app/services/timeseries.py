@@ -0,0 +1,179 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Date, case, cast, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction, TransactionType
+
+GRANULARITIES = ("day", "week", "month", "year")
+
+# Upper bound on buckets per series, to keep responses and gap filling small
+MAX_POINTS = 1000
+
+LABEL_FORMATS = {
+    "day": "%d %b %Y",
+    "week": "%d %b %Y",
+    "month": "%b %Y",
+    "year": "%Y",
+}
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """Return the first day of the bucket containing `day` (weeks start on Monday)."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_bucket(start: date, granularity: str) -> date:
+    """Return the first day of the bucket following the one starting at `start`."""
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    if granularity == "year":
+        return date(start.year + 1, 1, 1)
+    return start + timedelta(days=1)
+
+
+def bucket_count(start: date, end: date, granularity: str) -> int:
+    """Return how many buckets a range spans."""
+    first, last = bucket_start(start, granularity), bucket_start(end, granularity)
+    if granularity == "day":
+        return (last - first).days + 1
+    if granularity == "week":
+        return (last - first).days // 7 + 1
+    if granularity == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    return last.year - first.year + 1
+
+
+def bucket_expression(column, granularity: str, dialect: str):
+    """
+    Build a SQL expression truncating a date column to its bucket start.
+    
+    Args:
+        column: Date column
+        granularity: One of GRANULARITIES
+        dialect: "postgresql" or "sqlite"
+        
+    Returns:
+        ColumnElement: Bucket start (a date, or an ISO date string on SQLite)
+    """
+    if granularity == "day":
+        return column
+    if dialect == "postgresql":
+        # Inline the unit so GROUP BY matches the selected expression exactly
+        return cast(func.date_trunc(literal_column(f"'{granularity}'"), column), Date)
+    if granularity == "week":
+        return func.date(column, "weekday 0", "-6 days")
+    if granularity == "month":
+        return func.strftime("%Y-%m-01", column)
+    return func.strftime("%Y-01-01", column)
+
+
+async def _add_bucket_totals(
+    db: AsyncSession,
+    totals: Dict[date, Tuple[Decimal, Decimal]],
+    granularity: str,
+    columns: Tuple,
+    conditions: Tuple
+) -> None:
+    # Add (income, expense) per bucket of one source to `totals`
+    day_column, amount, type_column = columns
+    bucket = bucket_expression(day_column, granularity, db.bind.dialect.name).label("bucket")
+    result = await db.execute(
+        select(
+            bucket,
+            func.sum(case((type_column == TransactionType.INCOME, amount), else_=0)).label("income"),
+            func.sum(case((type_column == TransactionType.EXPENSE, amount), else_=0)).label("expense")
+        )
+        .filter(*conditions)
+        .group_by(bucket)
+    )
+    zero = (Decimal("0.00"), Decimal("0.00"))
+    for row in result:
+        period = row.bucket if isinstance(row.bucket, date) else date.fromisoformat(row.bucket)
+        income, expense = totals.get(period, zero)
+        totals[period] = (income + (row.income or 0), expense + (row.expense or 0))
+
+
+async def income_expense_series(
+    db: AsyncSession,
+    user_id: int,
+    start: date,
+    end: date,
+    granularity: str = "month"
+) -> List[Dict]:
+    """
+    Compute income, expense and net totals per time bucket.
+    
+    Months that lie entirely inside the range are aggregated from the
+    monthly rollups, so multi-year ranges only touch a few rows per month.
+    Everything else (day and week buckets, and the partial months at the
+    edges of a month or year range) is aggregated from transactions in SQL,
+    so no bucket counts transactions outside the range. Empty buckets are
+    filled with zeros in a single pass.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the transactions
+        start: First day of the range
+        end: Last day of the range
+        granularity: One of GRANULARITIES
+        
+    Returns:
+        List[dict]: {"period", "label", "income", "expense", "net"} per bucket
+    """
+    transaction_columns = (Transaction.transaction_date, Transaction.amount, Transaction.transaction_type)
+    in_range = (
+        Transaction.user_id == user_id,
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date <= end
+    )
+    
+    totals = {}
+    if granularity in ("month", "year"):
+        # Whole months covered by the range: [full_start, full_end)
+        full_start = start if start.day == 1 else next_bucket(bucket_start(start, "month"), "month")
+        full_end = bucket_start(end + timedelta(days=1), "month")
+        if full_start < full_end:
+            await _add_bucket_totals(
+                db, totals, granularity,
+                (MonthlyRollup.month, MonthlyRollup.total, MonthlyRollup.transaction_type),
+                (
+                    MonthlyRollup.user_id == user_id,
+                    MonthlyRollup.month >= full_start,
+                    MonthlyRollup.month < full_end
+                )
+            )
+            in_range += (or_(
+                Transaction.transaction_date < full_start,
+                Transaction.transaction_date >= full_end
+            ),)
+        if start < full_start or full_end <= end:
+            await _add_bucket_totals(db, totals, granularity, transaction_columns, in_range)
+    else:
+        await _add_bucket_totals(db, totals, granularity, transaction_columns, in_range)
+    
+    series = []
+    zero = (Decimal("0.00"), Decimal("0.00"))
+    period = bucket_start(start, granularity)
+    while period <= end:
+        income, expense = totals.get(period, zero)
+        series.append({
+            "period": period.isoformat(),
+            "label": period.strftime(LABEL_FORMATS[granularity]),
+            "income": float(income),
+            "expense": float(expense),
+            "net": float(income - expense)
+        })
+        period = next_bucket(period, granularity)
+    return series
@@ -0,0 +1,23 @@
+"""
+Benchmarks of performance-sensitive paths, run from the backend directory:
+
+    python -m benchmarks.startup        # application startup time
+    python -m benchmarks.login_storm    # event loop lag during concurrent logins
+    python -m benchmarks.token_decode   # JWT verification with and without the token cache
+
+They use a scratch SQLite database unless BENCHMARK_DATABASE_URL and
+BENCHMARK_DATABASE_URL_SYNC point at another database. Call
+`use_benchmark_database` before importing anything from `app`.
+"""
+import os
+import tempfile
+
+
+def use_benchmark_database() -> None:
+    """Configure the application for a benchmark run through environment variables."""
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    os.environ["DATABASE_URL"] = os.environ.get("BENCHMARK_DATABASE_URL", f"sqlite+aiosqlite:///{path}")
+    os.environ["DATABASE_URL_SYNC"] = os.environ.get("BENCHMARK_DATABASE_URL_SYNC", f"sqlite:///{path}")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ["DEBUG"] = "False"
+    os.environ["DB_MIGRATE_ON_STARTUP"] = "False"
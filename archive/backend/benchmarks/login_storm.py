@@ -0,0 +1,76 @@
+"""
+Measure event loop lag while many logins verify their passwords at once.
+
+A /health probe runs every few milliseconds during the storm; its latency
+shows how long the event loop is blocked. bcrypt runs in the
+PASSWORD_HASH_WORKERS thread pool, so the probe should stay fast while
+the logins queue for a thread.
+
+    python -m benchmarks.login_storm [--logins 32]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from benchmarks import use_benchmark_database
+
+PROBE_INTERVAL_SECONDS = 0.005
+
+
+async def run(logins: int):
+    """Run the login storm through the ASGI app and print the measurements."""
+    import httpx
+    from app.core.schema import upgrade_schema
+    from app.main import app
+    
+    upgrade_schema()
+    for handler in app.router.on_startup:
+        await handler()
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        credentials = {"email": f"{uuid.uuid4().hex}@example.com", "password": "secret123"}
+        response = await client.post("/api/v1/auth/register", json={**credentials, "full_name": "Benchmark"})
+        response.raise_for_status()
+        # Warm up the login path so one-time setup is not measured
+        response = await client.post("/api/v1/auth/login", json=credentials)
+        response.raise_for_status()
+        
+        probe_latencies = []
+        storm_done = asyncio.Event()
+        
+        async def probe():
+            while not storm_done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                probe_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+        
+        async def login():
+            started = time.perf_counter()
+            response = await client.post("/api/v1/auth/login", json=credentials)
+            response.raise_for_status()
+            return time.perf_counter() - started
+        
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        login_latencies = await asyncio.gather(*[login() for _ in range(logins)])
+        elapsed = time.perf_counter() - started
+        storm_done.set()
+        await prober
+    
+    probe_latencies.sort()
+    p99 = probe_latencies[int(len(probe_latencies) * 0.99)]
+    print(f"logins: {logins / elapsed:.1f}/s, median {statistics.median(login_latencies) * 1000:.0f} ms")
+    print(f"/health during the storm: median {statistics.median(probe_latencies) * 1000:.1f} ms, "
+          f"p99 {p99 * 1000:.1f} ms, max {probe_latencies[-1] * 1000:.1f} ms ({len(probe_latencies)} probes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=32, help="Number of concurrent logins")
+    args = parser.parse_args()
+    use_benchmark_database()
+    asyncio.run(run(args.logins))
@@ -0,0 +1,54 @@
+"""
+Time application startup against an already migrated database.
+
+This is the rolling-restart case: each run starts a fresh interpreter,
+imports app.main and runs the startup handler, which must only check the
+schema state.
+
+    python -m benchmarks.startup [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks import use_benchmark_database
+
+CHILD = """
+import asyncio, contextlib, io, time
+started = time.perf_counter()
+from app.main import startup_event
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    asyncio.run(startup_event())
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def main(runs: int = 20):
+    """Print the median import and startup times over `runs` fresh processes."""
+    use_benchmark_database()
+    from app.core.schema import upgrade_schema
+    upgrade_schema()
+    
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    imports, startups = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD], cwd=backend_dir, env=os.environ,
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        imports.append(float(output[-2]))
+        startups.append(float(output[-1]))
+    
+    print(f"import app.main: median {statistics.median(imports) * 1000:.1f} ms")
+    print(f"startup handler: median {statistics.median(startups) * 1000:.1f} ms "
+          f"(min {min(startups) * 1000:.1f}, max {max(startups) * 1000:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20, help="Number of fresh processes to time")
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,102 @@
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config
+from sqlalchemy import pool
+
+from alembic import context
+
+from app.core.config import settings
+from app.core.database import Base
+
+# Import models to register them with Base for autogenerate
+from app.models.user import User
+from app.models.account import Account
+from app.models.account_daily_balance import AccountDailyBalance
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.budget import Budget
+from app.models.budget_alert import BudgetAlert
+from app.models.worker_checkpoint import WorkerCheckpoint
+from app.models.data_version import DataVersion
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+# The application settings are the source of truth for the database URL
+# ("%" is the ini interpolation character).
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL_SYNC.replace("%", "%%"))
+
+# Interpret the config file for Python logging, without silencing the
+# application's loggers when migrations run from inside the app.
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Full-text search objects are raw DDL in a migration, not part of the models
+SEARCH_OBJECT_PREFIXES = ("transactions_fts", "search_vector", "ix_transactions_search")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from proposing to drop the search index objects."""
+    return not (name or "").startswith(SEARCH_OBJECT_PREFIXES)
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode.
+
+    This configures the context with just a URL
+    and not an Engine, though an Engine is acceptable
+    here as well.  By skipping the Engine creation
+    we don't even need a DBAPI to be available.
+
+    Calls to context.execute() here emit the given string to the
+    script output.
+
+    """
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
+
+    """
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite can only ALTER tables through batch (copy-and-move) mode
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
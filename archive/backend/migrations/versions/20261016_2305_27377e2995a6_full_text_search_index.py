@@ -0,0 +1,70 @@
+"""full text search index
+
+Moves the search index DDL out of application startup. Statements use
+IF NOT EXISTS because earlier versions created the same objects on boot.
+
+Revision ID: 27377e2995a6
+Revises: 74e51ee9d4e5
+Create Date: 2026-10-16 23:05:48.367386
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27377e2995a6'
+down_revision: Union[str, None] = '74e51ee9d4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE transactions ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, '') || ' ' || coalesce(notes, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_transactions_search ON transactions USING GIN (search_vector)",
+]
+
+# External-content FTS5 table; the triggers keep it in sync with every
+# insert, update and delete on transactions, including bulk writes.
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, notes, content='transactions', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description, notes) VALUES (new.id, new.description, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, notes) "
+    "VALUES ('delete', old.id, old.description, old.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, notes) "
+    "VALUES ('delete', old.id, old.description, old.notes); "
+    "INSERT INTO transactions_fts(rowid, description, notes) VALUES (new.id, new.description, new.notes); END",
+    # Index rows written before the table existed
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        try:
+            for statement in SQLITE_SEARCH_DDL:
+                op.execute(statement)
+        except sa.exc.OperationalError as e:
+            # SQLite built without FTS5: searches keep using ILIKE
+            print(f"Search index unavailable, using ILIKE fallback: {e}")
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_transactions_search")
+        op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("transactions_fts_ai", "transactions_fts_ad", "transactions_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS transactions_fts")
@@ -0,0 +1,205 @@
+"""baseline schema
+
+Creates every table, index and enum type of the models. Databases built
+before migrations existed (by `Base.metadata.create_all` and the startup
+currency ALTER) are adopted in place: only missing tables, columns and
+indexes are created, so upgrading them to head needs no manual stamping.
+
+Revision ID: 74e51ee9d4e5
+Revises:
+Create Date: 2026-10-16 23:05:12.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '74e51ee9d4e5'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum columns store member names; on PostgreSQL they are native types
+# created once below and shared by transactions and monthly_rollups.
+account_type = postgresql.ENUM('CHECKING', 'SAVINGS', 'CREDIT', 'CASH', name='accounttype', create_type=False)
+transaction_type = postgresql.ENUM('INCOME', 'EXPENSE', name='transactiontype', create_type=False)
+
+# (name, table, columns, unique)
+INDEXES = [
+    ('ix_users_id', 'users', ['id'], False),
+    ('ix_users_email', 'users', ['email'], True),
+    ('ix_categories_id', 'categories', ['id'], False),
+    ('ix_categories_name', 'categories', ['name'], True),
+    ('ix_accounts_id', 'accounts', ['id'], False),
+    ('ix_transactions_id', 'transactions', ['id'], False),
+    ('ix_transactions_transaction_date', 'transactions', ['transaction_date'], False),
+    ('ix_transactions_user_date_created_id', 'transactions', ['user_id', 'transaction_date', 'created_at', 'id'], False),
+    ('ix_budgets_id', 'budgets', ['id'], False),
+    ('ix_budgets_month', 'budgets', ['month'], False),
+    ('ix_budgets_user_month', 'budgets', ['user_id', 'month'], False),
+    ('ix_budget_categories_id', 'budget_categories', ['id'], False),
+    ('ix_budget_categories_budget_id', 'budget_categories', ['budget_id'], False),
+    ('ix_budget_alerts_user_id_id', 'budget_alerts', ['user_id', 'id'], False),
+    ('ix_budget_alerts_budget_category_id_id', 'budget_alerts', ['budget_category_id', 'id'], False),
+]
+
+
+def _tables() -> dict:
+    # Table name -> columns and constraints, in dependency order
+    return {
+        'users': (
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('hashed_password', sa.String(), nullable=False),
+            sa.Column('full_name', sa.String(), nullable=False),
+            sa.Column('currency', sa.String(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('is_superuser', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        ),
+        'categories': (
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('icon', sa.String(), nullable=True),
+            sa.Column('color', sa.String(), nullable=True),
+            sa.Column('is_default', sa.Boolean(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        ),
+        'accounts': (
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('account_type', account_type, nullable=False),
+            sa.Column('balance', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.Column('currency', sa.String(length=3), nullable=False),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        ),
+        'transactions': (
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.Column('transaction_type', transaction_type, nullable=False),
+            sa.Column('description', sa.String(), nullable=False),
+            sa.Column('transaction_date', sa.Date(), nullable=False),
+            sa.Column('notes', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('account_id', sa.Integer(), nullable=False),
+            sa.Column('category_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['account_id'], ['accounts.id']),
+            sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        ),
+        'budgets': (
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('month', sa.Date(), nullable=False),
+            sa.Column('total_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        ),
+        'budget_categories': (
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('allocated_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.Column('spent_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.Column('budget_id', sa.Integer(), nullable=False),
+            sa.Column('category_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['budget_id'], ['budgets.id']),
+            sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+            sa.PrimaryKeyConstraint('id'),
+        ),
+        'account_daily_balances': (
+            sa.Column('account_id', sa.Integer(), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('net_change', sa.Numeric(precision=12, scale=2), nullable=False),
+            sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('account_id', 'day'),
+        ),
+        'monthly_rollups': (
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('month', sa.Date(), nullable=False),
+            sa.Column('category_id', sa.Integer(), nullable=False),
+            sa.Column('transaction_type', transaction_type, nullable=False),
+            sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('user_id', 'month', 'category_id', 'transaction_type'),
+        ),
+        'budget_alerts': (
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('budget_id', sa.Integer(), nullable=False),
+            sa.Column('budget_category_id', sa.Integer(), nullable=False),
+            sa.Column('category_id', sa.Integer(), nullable=False),
+            sa.Column('month', sa.Date(), nullable=False),
+            sa.Column('previous_status', sa.String(), nullable=True),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('percentage', sa.Float(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['budget_category_id'], ['budget_categories.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        ),
+        'worker_checkpoints': (
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('name'),
+        ),
+    }
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Offline (--sql) mode cannot inspect, so it assumes an empty database
+    inspector = None if context.is_offline_mode() else sa.inspect(bind)
+    existing = set(inspector.get_table_names()) if inspector else set()
+
+    for enum in (account_type, transaction_type):
+        enum.create(bind, checkfirst=inspector is not None)
+
+    for name, columns in _tables().items():
+        if name not in existing:
+            op.create_table(name, *columns)
+
+    # Replaces the ALTER that used to run on every application start
+    if 'users' in existing and 'currency' not in {c['name'] for c in inspector.get_columns('users')}:
+        op.add_column('users', sa.Column('currency', sa.String(), server_default='USD', nullable=True))
+
+    # create_all never added indexes to tables that already existed
+    indexes = {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in existing
+    } if inspector else {}
+    for name, table, columns, unique in INDEXES:
+        if name not in indexes.get(table, set()):
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for name, table, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for name in reversed(list(_tables())):
+        op.drop_table(name)
+
+    bind = op.get_bind()
+    for enum in (transaction_type, account_type):
+        enum.drop(bind, checkfirst=not context.is_offline_mode())
@@ -0,0 +1,86 @@
+"""populate derived tables
+
+Fills the tables maintained by transaction writes from the transactions
+table: daily account balance snapshots, monthly rollups and the
+spent_amount of budget allocations. Databases adopted by the baseline
+revision had transactions but empty derived tables, so dashboards and
+budgets showed zero until the rebuild commands were run by hand.
+
+The tables are rebuilt in full, which is also correct for databases whose
+derived data was already maintained.
+
+Revision ID: 82fbb42fe78e
+Revises: 27377e2995a6
+Create Date: 2026-10-16 23:22:37.128344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '82fbb42fe78e'
+down_revision: Union[str, None] = '27377e2995a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# First day of the month of a date column, and of the month after it
+MONTH_START = {
+    "postgresql": "CAST(date_trunc('month', {column}) AS DATE)",
+    "sqlite": "date({column}, 'start of month')",
+}
+NEXT_MONTH_START = {
+    "postgresql": "CAST(date_trunc('month', {column}) + INTERVAL '1 month' AS DATE)",
+    "sqlite": "date({column}, 'start of month', '+1 month')",
+}
+
+DAILY_BALANCES = """
+INSERT INTO account_daily_balances (account_id, day, net_change)
+SELECT account_id, transaction_date,
+       SUM(CASE WHEN transaction_type = 'INCOME' THEN amount ELSE -amount END)
+FROM transactions
+GROUP BY account_id, transaction_date
+"""
+
+# Uncategorized transactions are stored under category_id 0
+MONTHLY_ROLLUPS = """
+INSERT INTO monthly_rollups (user_id, month, category_id, transaction_type, total, count)
+SELECT user_id, {month}, COALESCE(category_id, 0), transaction_type, SUM(amount), COUNT(*)
+FROM transactions
+GROUP BY user_id, {month}, COALESCE(category_id, 0), transaction_type
+"""
+
+# Expenses of the allocation's category in the calendar month of its budget
+SPENT_AMOUNTS = """
+UPDATE budget_categories
+SET spent_amount = COALESCE((
+    SELECT SUM(t.amount)
+    FROM transactions t
+    JOIN budgets b ON b.id = budget_categories.budget_id
+    WHERE t.user_id = b.user_id
+      AND t.category_id = budget_categories.category_id
+      AND t.transaction_type = 'EXPENSE'
+      AND t.transaction_date >= {month_start}
+      AND t.transaction_date < {next_month_start}
+), 0)
+"""
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    month = MONTH_START[dialect].format(column="transaction_date")
+
+    op.execute("DELETE FROM account_daily_balances")
+    op.execute(DAILY_BALANCES)
+    op.execute("DELETE FROM monthly_rollups")
+    op.execute(MONTHLY_ROLLUPS.format(month=month))
+    op.execute(SPENT_AMOUNTS.format(
+        month_start=MONTH_START[dialect].format(column="b.month"),
+        next_month_start=NEXT_MONTH_START[dialect].format(column="b.month"),
+    ))
+
+
+def downgrade() -> None:
+    # Derived data only; the tables themselves belong to the baseline
+    pass
@@ -0,0 +1,32 @@
+"""add month to worker checkpoints
+
+A checkpoint records the month of the run it belongs to, so a run for a
+new month starts from the first user instead of resuming the position
+left by an unfinished run for an earlier month.
+
+Revision ID: ceb33698e39b
+Revises: 82fbb42fe78e
+Create Date: 2026-10-16 23:36:12.183058
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ceb33698e39b'
+down_revision: Union[str, None] = '82fbb42fe78e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('worker_checkpoints') as batch_op:
+        batch_op.add_column(sa.Column('month', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('worker_checkpoints') as batch_op:
+        batch_op.drop_column('month')
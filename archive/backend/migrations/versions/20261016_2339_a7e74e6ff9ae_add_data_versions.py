@@ -0,0 +1,36 @@
+"""add data versions
+
+Cache scope versions used to be counters in each worker's memory (or in
+Redis when enabled), so ETags and cache keys differed between workers and
+went back to zero on restart. They are now rows incremented by every
+write transaction.
+
+Revision ID: a7e74e6ff9ae
+Revises: ceb33698e39b
+Create Date: 2026-10-16 23:39:00.668704
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e74e6ff9ae'
+down_revision: Union[str, None] = 'ceb33698e39b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'data_versions',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
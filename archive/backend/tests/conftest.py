@@ -0,0 +1,98 @@
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+# Tests run against a throwaway SQLite database unless TEST_DATABASE_URL and
+# TEST_DATABASE_URL_SYNC point at another (e.g. PostgreSQL) database.
+_sqlite_path = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite+aiosqlite:///{_sqlite_path}")
+os.environ["DATABASE_URL_SYNC"] = os.environ.get("TEST_DATABASE_URL_SYNC", f"sqlite:///{_sqlite_path}")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-the-test-suite")
+os.environ["DEBUG"] = "False"
+os.environ["CACHE_REDIS_ENABLED"] = "False"
+os.environ.pop("DATABASE_READ_URL", None)
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.core.database import async_engine
+from app.core.schema import upgrade_schema
+from app.main import app
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    """Migrate the test database to the newest revision once per run."""
+    upgrade_schema()
+
+
+@pytest.fixture
+async def client():
+    """Unauthenticated API client running the app's startup handlers."""
+    for handler in app.router.on_startup:
+        await handler()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield client
+    # Pooled connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+@contextmanager
+def _recorded_statements():
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def recorded_statements():
+    """Context manager collecting the SQL statements executed on the primary engine."""
+    return _recorded_statements
+
+
+async def register(client: httpx.AsyncClient, password: str = "secret123") -> str:
+    """Register a user with a unique email and return the email."""
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = await client.post(
+        "/auth/register", json={"email": email, "password": password, "full_name": "Test User"}
+    )
+    assert response.status_code == 201, response.text
+    return email
+
+
+@pytest.fixture
+async def auth_client(client):
+    """API client logged in as a fresh user."""
+    email = await register(client)
+    response = await client.post("/auth/login", json={"email": email, "password": "secret123"})
+    assert response.status_code == 200, response.text
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+    return client
+
+
+@pytest.fixture
+async def account(auth_client):
+    """Checking account of the logged-in user with a balance of 100.00."""
+    response = await auth_client.post(
+        "/accounts", json={"name": "Checking", "account_type": "checking", "balance": "100.00"}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+async def category(auth_client):
+    """A new category with a unique name."""
+    response = await auth_client.post("/categories", json={"name": f"Category {uuid.uuid4().hex[:8]}"})
+    assert response.status_code == 201, response.text
+    return response.json()
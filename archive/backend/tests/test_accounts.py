@@ -0,0 +1,13 @@
+async def test_balance_history_rejects_ranges_with_too_many_points(auth_client, account):
+    response = await auth_client.get(
+        f"/accounts/{account['id']}/balance-history",
+        params={"start": "0001-01-01", "end": "2026-01-01"}
+    )
+    assert response.status_code == 400
+    
+    response = await auth_client.get(
+        f"/accounts/{account['id']}/balance-history",
+        params={"start": "2020-01-01", "end": "2026-01-01", "granularity": "month"}
+    )
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 73
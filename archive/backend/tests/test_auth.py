@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from jose import JWTError
+from sqlalchemy import event
+
+from app.core import cache, security
+from app.core.cache import identity_cache
+from app.core.database import async_engine
+
+
+async def test_authenticated_reads_do_not_commit(auth_client):
+    commits = []
+    
+    def on_commit(conn):
+        commits.append(conn)
+    
+    # Force the user row to be loaded from the database
+    identity_cache._local.clear()
+    event.listen(async_engine.sync_engine, "commit", on_commit)
+    try:
+        response = await auth_client.get("/accounts")
+    finally:
+        event.remove(async_engine.sync_engine, "commit", on_commit)
+    
+    assert response.status_code == 200, response.text
+    assert commits == []
+
+
+async def test_logins_verify_passwords_off_the_event_loop(auth_client, monkeypatch):
+    email = (await auth_client.get("/auth/me")).json()["email"]
+    threads = []
+    verify_password = security.verify_password
+    
+    def recording_verify_password(plain_password, hashed_password):
+        threads.append(threading.current_thread())
+        return verify_password(plain_password, hashed_password)
+    
+    monkeypatch.setattr(security, "verify_password", recording_verify_password)
+    responses = await asyncio.gather(*[
+        auth_client.post("/auth/login", json={"email": email, "password": "secret123"})
+        for _ in range(8)
+    ])
+    
+    assert [response.status_code for response in responses] == [200] * 8
+    assert len(threads) == 8
+    assert threading.main_thread() not in threads
+    assert security.password_pool_stats()["pending"] == 0
+
+
+def test_decode_token_verifies_each_token_once(monkeypatch):
+    token = security.create_access_token({"sub": "1"})
+    calls = []
+    decode = security.jwt.decode
+    
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+    
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    payloads = [security.decode_token(token) for _ in range(3)]
+    
+    assert calls == [token]
+    assert payloads[0] == payloads[2]
+
+
+def test_decode_token_rejects_tokens_after_they_expire(monkeypatch):
+    token = security.create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=60))
+    security.decode_token(token)
+    
+    # A minute later the cached payload has expired and jose rejects the token
+    now = time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + 61)
+    
+    def expired(*args, **kwargs):
+        raise JWTError("Signature has expired.")
+    
+    monkeypatch.setattr(security.jwt, "decode", expired)
+    with pytest.raises(HTTPException) as error:
+        security.decode_token(token)
+    assert error.value.status_code == 401
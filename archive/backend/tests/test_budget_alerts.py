@@ -0,0 +1,34 @@
+from datetime import date
+
+from app.core.database import AsyncSessionLocal
+from app.services.budget_alerts import _save_checkpoint, run_evaluator
+
+
+async def test_evaluator_ignores_a_checkpoint_from_another_month(auth_client, account, category):
+    user_id = (await auth_client.get("/auth/me")).json()["id"]
+    response = await auth_client.post("/budgets", json={
+        "category_id": category["id"],
+        "amount": "10.00",
+        "start_date": "2026-04-01T00:00:00"
+    })
+    assert response.status_code == 201, response.text
+    response = await auth_client.post("/transactions", json={
+        "amount": "20.00",
+        "transaction_type": "expense",
+        "description": "groceries",
+        "transaction_date": "2026-04-05",
+        "category_id": category["id"],
+        "account_id": account["id"]
+    })
+    assert response.status_code == 201, response.text
+    
+    # An unfinished March run that had already passed this user
+    async with AsyncSessionLocal() as db:
+        await _save_checkpoint(db, date(2026, 3, 1), user_id)
+        await db.commit()
+    
+    await run_evaluator(date(2026, 4, 1))
+    
+    response = await auth_client.get("/budgets/alerts")
+    assert response.status_code == 200, response.text
+    assert [alert["status"] for alert in response.json()] == ["exceeded"]
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.database import AsyncSessionLocal
+from app.models.budget import BudgetCategory
+from app.services import budgets
+
+
+@pytest.fixture
+async def allocation(auth_client, account, category):
+    """ID of a March 2026 budget allocation with 5.00 spent in it."""
+    response = await auth_client.post("/budgets", json={
+        "category_id": category["id"],
+        "amount": "50.00",
+        "start_date": "2026-03-01T00:00:00"
+    })
+    assert response.status_code == 201, response.text
+    response = await auth_client.post("/transactions", json={
+        "amount": "5.00",
+        "transaction_type": "expense",
+        "description": "groceries",
+        "transaction_date": "2026-03-05",
+        "category_id": category["id"],
+        "account_id": account["id"]
+    })
+    assert response.status_code == 201, response.text
+    
+    async with AsyncSessionLocal() as db:
+        allocation_id = await db.scalar(
+            select(BudgetCategory.id).where(BudgetCategory.category_id == category["id"])
+        )
+        await corrupt_spent(db, allocation_id)
+        await db.commit()
+    return allocation_id
+
+
+async def corrupt_spent(db, allocation_id: int):
+    await db.execute(
+        update(BudgetCategory)
+        .where(BudgetCategory.id == allocation_id)
+        .values(spent_amount=BudgetCategory.spent_amount + 1)
+    )
+
+
+async def spent(db, allocation_id: int) -> Decimal:
+    return await db.scalar(select(BudgetCategory.spent_amount).where(BudgetCategory.id == allocation_id))
+
+
+async def test_repair_spent_fixes_drift(allocation):
+    async with AsyncSessionLocal() as db:
+        assert await budgets.repair_spent(db) >= 1
+        await db.commit()
+        assert await spent(db, allocation) == Decimal("5.00")
+
+
+async def test_repair_spent_skips_allocations_changed_since_they_were_read(allocation, monkeypatch):
+    find_spent_drift = budgets.find_spent_drift
+    
+    async def write_in_between(db):
+        # Stands in for an expense committed after the drift query
+        drift = await find_spent_drift(db)
+        await corrupt_spent(db, allocation)
+        return drift
+    
+    monkeypatch.setattr(budgets, "find_spent_drift", write_in_between)
+    async with AsyncSessionLocal() as db:
+        await budgets.repair_spent(db)
+        assert await spent(db, allocation) == Decimal("7.00")
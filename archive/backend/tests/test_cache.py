@@ -0,0 +1,83 @@
+import uuid
+
+from app.core import cache
+from app.core.cache import is_pinned_to_primary, response_cache, user_scope
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, read_session
+from app.models.data_version import DataVersion
+
+
+async def test_etags_survive_a_worker_restart(auth_client):
+    user_id = (await auth_client.get("/auth/me")).json()["id"]
+    before = (await auth_client.get("/accounts")).headers["etag"]
+    
+    response = await auth_client.post("/accounts", json={"name": "Savings", "account_type": "savings"})
+    assert response.status_code == 201, response.text
+    after = (await auth_client.get("/accounts")).headers["etag"]
+    assert after != before
+    
+    # A fresh worker has no in-process state
+    response_cache._versions.clear()
+    response_cache._local.clear()
+    response = await auth_client.get("/accounts", headers={"If-None-Match": before})
+    assert response.status_code == 200
+    assert response.headers["etag"] == after
+    
+    async with AsyncSessionLocal() as db:
+        version = await db.get(DataVersion, user_scope(user_id))
+    assert version.version == 1
+
+
+async def test_imports_bump_the_data_version_per_batch(auth_client, account):
+    user_id = (await auth_client.get("/auth/me")).json()["id"]
+    response = await auth_client.post("/transactions/import", files={
+        "file": ("rows.jsonl", b'{"amount": "1.00", "transaction_type": "expense", '
+                              b'"description": "a", "transaction_date": "2026-01-01"}\n')
+    }, data={"account_id": str(account["id"])})
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 1
+    
+    async with AsyncSessionLocal() as db:
+        version = await db.get(DataVersion, user_scope(user_id))
+    # Creating the account, then the import's single batch
+    assert version.version == 2
+
+
+async def test_etags_differ_between_users(auth_client):
+    etag = (await auth_client.get("/accounts")).headers["etag"]
+    
+    credentials = {"email": f"{uuid.uuid4().hex}@example.com", "password": "secret123"}
+    response = await auth_client.post("/auth/register", json={**credentials, "full_name": "Other User"})
+    assert response.status_code == 201, response.text
+    response = await auth_client.post("/auth/login", json=credentials)
+    other_token = response.json()["access_token"]
+    response = await auth_client.get(
+        "/accounts", headers={"Authorization": f"Bearer {other_token}", "If-None-Match": etag}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_workers_without_a_pin_read_from_the_primary_until_the_replica_catches_up(auth_client, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", "sqlite+aiosqlite:///replica.db")
+    user_id = (await auth_client.get("/auth/me")).json()["id"]
+    response = await auth_client.post("/accounts", json={"name": "Savings", "account_type": "savings"})
+    assert response.status_code == 201, response.text
+    assert await is_pinned_to_primary(user_id)
+    
+    # Another worker, without Redis, whose replica has not replayed the write
+    cache._primary_pins.clear()
+    
+    def lagging_read_session(use_primary: bool = False):
+        session = read_session(use_primary)
+        if not use_primary:
+            session.info["data_versions"] = {user_scope(user_id): 0}
+        return session
+    
+    monkeypatch.setattr(cache, "read_session", lagging_read_session)
+    assert await is_pinned_to_primary(user_id)
+    
+    # Once the replica has the write (the test replica is the primary)
+    monkeypatch.setattr(cache, "read_session", read_session)
+    assert not await is_pinned_to_primary(user_id)
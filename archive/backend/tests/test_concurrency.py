@@ -0,0 +1,71 @@
+import asyncio
+from decimal import Decimal
+
+# Parallel requests per test
+WRITERS = 200
+
+# Statuses of writes that lost a race and may be retried
+RETRYABLE = {409, 503}
+
+
+async def balance(client, account_id: int) -> Decimal:
+    response = await client.get(f"/accounts/{account_id}")
+    assert response.status_code == 200, response.text
+    return Decimal(response.json()["balance"])
+
+
+async def create(client, account_id: int, amount: str, transaction_type: str = "expense"):
+    return await client.post("/transactions", json={
+        "amount": amount,
+        "transaction_type": transaction_type,
+        "description": "concurrent",
+        "transaction_date": "2026-01-15",
+        "account_id": account_id
+    })
+
+
+async def test_parallel_creates_apply_every_balance_change_once(auth_client, account):
+    amounts = [f"{i}.25" for i in range(1, WRITERS + 1)]
+    responses = await asyncio.gather(*(
+        create(auth_client, account["id"], amount, "income" if i % 2 else "expense")
+        for i, amount in enumerate(amounts)
+    ))
+    
+    expected = Decimal("100.00")
+    for i, (amount, response) in enumerate(zip(amounts, responses)):
+        # A database may reject a conflicting writer, but never half-apply it
+        assert response.status_code == 201 or response.status_code in RETRYABLE, response.text
+        if response.status_code == 201:
+            expected += Decimal(amount) if i % 2 else -Decimal(amount)
+    assert await balance(auth_client, account["id"]) == expected
+
+
+async def test_parallel_deletes_revert_the_transaction_once(auth_client, account):
+    response = await create(auth_client, account["id"], "30.00")
+    assert response.status_code == 201, response.text
+    transaction_id = response.json()["id"]
+    
+    responses = await asyncio.gather(*(
+        auth_client.delete(f"/transactions/{transaction_id}") for _ in range(WRITERS)
+    ))
+    
+    statuses = [response.status_code for response in responses]
+    assert statuses.count(204) == 1
+    assert set(statuses) <= {204, 404} | RETRYABLE
+    assert await balance(auth_client, account["id"]) == Decimal("100.00")
+
+
+async def test_parallel_updates_leave_balance_matching_final_amount(auth_client, account):
+    response = await create(auth_client, account["id"], "10.00")
+    assert response.status_code == 201, response.text
+    transaction_id = response.json()["id"]
+    
+    responses = await asyncio.gather(*(
+        auth_client.put(f"/transactions/{transaction_id}", json={"amount": f"{i}.00"})
+        for i in range(1, WRITERS + 1)
+    ))
+    assert {response.status_code for response in responses} <= {200} | RETRYABLE
+    
+    response = await auth_client.get(f"/transactions/{transaction_id}")
+    final_amount = Decimal(response.json()["amount"])
+    assert await balance(auth_client, account["id"]) == Decimal("100.00") - final_amount
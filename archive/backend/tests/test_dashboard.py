@@ -0,0 +1,36 @@
+import pytest
+
+
+@pytest.fixture
+async def expenses(auth_client, account, category):
+    """Expenses of 1, 2, 4, 8 and 16 spread over January to March 2026."""
+    for day, amount in (("2026-01-10", 1), ("2026-01-20", 2), ("2026-02-15", 4), ("2026-03-05", 8), ("2026-03-25", 16)):
+        response = await auth_client.post("/transactions", json={
+            "amount": str(amount),
+            "transaction_type": "expense",
+            "description": "groceries",
+            "transaction_date": day,
+            "category_id": category["id"],
+            "account_id": account["id"]
+        })
+        assert response.status_code == 201, response.text
+
+
+@pytest.mark.parametrize("granularity, expected", [
+    ("month", {"2026-01-01": 2, "2026-02-01": 4, "2026-03-01": 8}),
+    ("year", {"2026-01-01": 14}),
+])
+async def test_monthly_trends_edge_buckets_only_count_the_range(auth_client, expenses, granularity, expected):
+    response = await auth_client.get("/dashboard/monthly-trends", params={
+        "start": "2026-01-15", "end": "2026-03-10", "granularity": granularity
+    })
+    assert response.status_code == 200, response.text
+    assert {point["period"]: point["expense"] for point in response.json()} == expected
+
+
+async def test_monthly_trends_within_one_month(auth_client, expenses):
+    response = await auth_client.get("/dashboard/monthly-trends", params={
+        "start": "2026-03-01", "end": "2026-03-10"
+    })
+    assert response.status_code == 200, response.text
+    assert [point["expense"] for point in response.json()] == [8]
@@ -0,0 +1,51 @@
+import pytest
+
+
+async def upload(client, content: bytes, account_id: int):
+    return await client.post(
+        "/transactions/import",
+        files={"file": ("statement.json", content, "application/json")},
+        data={"account_id": str(account_id)}
+    )
+
+
+async def test_malformed_json_array_is_reported_as_file_error(auth_client, account):
+    response = await upload(auth_client, b'[{"amount": 1}, ', account["id"])
+    
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["imported"] == 0
+    assert body["failed"] == 1
+    assert body["errors"][0]["row"] == 0
+    assert body["errors"][0]["error"].startswith("Invalid JSON")
+
+
+async def test_json_array_of_non_objects_is_reported_per_row(auth_client, account):
+    content = b'[1, "x", {"amount": "5.00", "description": "ok", "date": "2026-01-02", "type": "expense"}]'
+    response = await upload(auth_client, content, account["id"])
+    
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["imported"] == 1
+    assert body["failed"] == 2
+    assert [error["row"] for error in body["errors"]] == [1, 2]
+
+
+@pytest.mark.parametrize("amount", ["NaN", "Infinity", "-inf", "1e20", "12345678901.00", "1.005"])
+async def test_invalid_amounts_are_reported_per_row(auth_client, account, amount):
+    content = (
+        "date,description,amount\n"
+        f"2026-01-02,bad,{amount}\n"
+        "2026-01-03,ok,-5.00\n"
+    ).encode()
+    response = await auth_client.post(
+        "/transactions/import",
+        files={"file": ("statement.csv", content, "text/csv")},
+        data={"account_id": str(account["id"])}
+    )
+    
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["imported"] == 1
+    assert body["failed"] == 1
+    assert body["errors"][0]["row"] == 2
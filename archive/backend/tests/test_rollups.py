@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+from sqlalchemy import select, update
+
+from app.core.database import AsyncSessionLocal
+from app.models.monthly_rollup import MonthlyRollup
+from app.services import rollups
+from app.services.rollups import find_rollup_drift
+
+
+async def user_drift(user_id: int):
+    async with AsyncSessionLocal() as db:
+        drift = await find_rollup_drift(db)
+    return {key: value for key, value in drift.items() if key[0] == user_id}
+
+
+async def test_deleting_a_category_moves_its_rollups_to_uncategorized(auth_client, account, category):
+    user_id = (await auth_client.get("/auth/me")).json()["id"]
+    for amount in ("3.00", "4.00"):
+        response = await auth_client.post("/transactions", json={
+            "amount": amount,
+            "transaction_type": "expense",
+            "description": "groceries",
+            "transaction_date": "2026-03-05",
+            "category_id": category["id"],
+            "account_id": account["id"]
+        })
+        assert response.status_code == 201, response.text
+    
+    response = await auth_client.delete(f"/categories/{category['id']}")
+    assert response.status_code == 204, response.text
+    
+    assert await user_drift(user_id) == {}
+
+
+async def expense(client, account, category, amount: str = "5.00"):
+    response = await client.post("/transactions", json={
+        "amount": amount,
+        "transaction_type": "expense",
+        "description": "groceries",
+        "transaction_date": "2026-03-05",
+        "category_id": category["id"],
+        "account_id": account["id"]
+    })
+    assert response.status_code == 201, response.text
+
+
+async def corrupt_rollup(db, user_id: int):
+    await db.execute(
+        update(MonthlyRollup)
+        .where(MonthlyRollup.user_id == user_id)
+        .values(total=MonthlyRollup.total + 1)
+    )
+
+
+async def test_repair_rollups_fixes_drift(auth_client, account, category):
+    user_id = (await auth_client.get("/auth/me")).json()["id"]
+    await expense(auth_client, account, category)
+    async with AsyncSessionLocal() as db:
+        await corrupt_rollup(db, user_id)
+        await db.commit()
+    assert await user_drift(user_id) != {}
+    
+    async with AsyncSessionLocal() as db:
+        assert await rollups.repair_rollups(db) >= 1
+        await db.commit()
+    
+    assert await user_drift(user_id) == {}
+
+
+async def test_repair_rollups_skips_rows_changed_since_they_were_read(auth_client, account, category, monkeypatch):
+    user_id = (await auth_client.get("/auth/me")).json()["id"]
+    await expense(auth_client, account, category)
+    async with AsyncSessionLocal() as db:
+        await corrupt_rollup(db, user_id)
+        await db.commit()
+    
+    expected_rollups = rollups.expected_rollups
+    
+    async def write_in_between(db):
+        # Stands in for a write committed between reading the rollups and the transactions
+        await corrupt_rollup(db, user_id)
+        return await expected_rollups(db)
+    
+    monkeypatch.setattr(rollups, "expected_rollups", write_in_between)
+    async with AsyncSessionLocal() as db:
+        await rollups.repair_rollups(db)
+        stored = await db.scalar(select(MonthlyRollup.total).where(MonthlyRollup.user_id == user_id))
+    
+    # Neither overwritten with a stale value nor corrected twice
+    assert stored == Decimal("7.00")
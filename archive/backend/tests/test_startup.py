@@ -0,0 +1,18 @@
+import re
+
+from app.core.database import async_engine
+from app.main import startup_event
+
+DDL = re.compile(r"^\s*(CREATE|ALTER|DROP)\b", re.IGNORECASE)
+
+
+async def test_startup_only_reads_the_schema_state(recorded_statements):
+    with recorded_statements() as statements:
+        await startup_event()
+    await async_engine.dispose()
+    
+    # The schema version check and the search index detection; SQLite's
+    # explicit BEGINs are not queries
+    queries = [s for s in statements if not s.strip().upper().startswith("BEGIN")]
+    assert len(queries) <= 2, queries
+    assert not [s for s in queries if DDL.match(s)]
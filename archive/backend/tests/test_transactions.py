@@ -0,0 +1,36 @@
+import re
+
+import pytest
+
+
+def transaction_queries(statements):
+    return [s for s in statements if re.search(r"\bFROM transactions\b", s)]
+
+
+@pytest.mark.parametrize("size", [1, 10, 50])
+async def test_list_transactions_uses_fixed_number_of_queries(auth_client, account, category, recorded_statements, size):
+    for i in range(30):
+        response = await auth_client.post("/transactions", json={
+            "amount": "1.00",
+            "transaction_type": "expense",
+            "description": f"item {i}",
+            "transaction_date": "2026-01-15",
+            "category_id": category["id"] if i % 2 else None,
+            "account_id": account["id"]
+        })
+        assert response.status_code == 201, response.text
+    # Authenticate once so the identity cache does not add a users query
+    await auth_client.get("/auth/me")
+    
+    with recorded_statements() as statements:
+        response = await auth_client.get("/transactions", params={"size": size, "count": "exact"})
+    
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total"] == 30
+    assert len(body["items"]) == min(size, 30)
+    assert body["items"][0]["account_name"] == "Checking"
+    # One count query and one page query joining account and category names,
+    # regardless of the page size
+    assert len(transaction_queries(statements)) == 2
+    assert not [s for s in statements if re.search(r"\bFROM (accounts|categories)\b", s)]
@@ -39,10 +39,17 @@ print("Starting Uvicorn...")
 # Assuming we run this script FROM the active venv or call the venv python directly.
 # Best way: Use the full path to venv python.
 venv_python = os.path.join("backend", "venv", "Scripts", "python.exe")
-if not os.path.exists(venv_python):
+if os.path.exists(venv_python):
+    # Resolve now; the commands below run inside backend/
+    venv_python = os.path.abspath(venv_python)
+else:
     print(f"Warning: {venv_python} not found, trying 'python'")
     venv_python = "python"
 
+# The server refuses to start until the schema is at head, so migrate first
+print("Applying migrations...")
+subprocess.run([venv_python, "-m", "alembic", "upgrade", "head"], cwd="backend", check=True)
+
 cmd = [venv_python, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "8000", "--reload"]
 # subprocess.Popen(cmd, cwd="backend") # Run in backend dir?
 # The app.main:app import looks for app/ inside current path.
@@ -13,12 +13,12 @@ import {
     CartesianGrid,
 } from 'recharts';
 
-import { CategorySpending } from '../../types';
+import { CategorySpending, MonthlyTrend } from '../../types';
 import { formatCurrency } from '@/utils/format';
 
 interface AnalyticsDashboardProps {
     spendingByCategory: CategorySpending[];
-    monthlyTrends: any[];
+    monthlyTrends: MonthlyTrend[];
     currency?: string;
 }
 
@@ -1,5 +1,5 @@
 import { baseApi } from './baseApi';
-import type { DashboardOverview, CategorySpending, Account, Transaction } from '@/types';
+import type { DashboardOverview, DashboardBundle, CategorySpending, MonthlyTrend, Account, Transaction } from '@/types';
 
 export const dashboardApi = baseApi.injectEndpoints({
     endpoints: (builder) => ({
@@ -19,10 +19,14 @@ export const dashboardApi = baseApi.injectEndpoints({
             query: () => '/dashboard/accounts-summary',
             providesTags: ['Dashboard'],
         }),
-        getMonthlyTrends: builder.query<any[], void>({
+        getMonthlyTrends: builder.query<MonthlyTrend[], void>({
             query: () => '/dashboard/monthly-trends',
             providesTags: ['Dashboard'],
         }),
+        getDashboardBundle: builder.query<DashboardBundle, string[] | void>({
+            query: (widgets) => (widgets ? `/dashboard/bundle?widgets=${widgets.join(',')}` : '/dashboard/bundle'),
+            providesTags: ['Dashboard'],
+        }),
     }),
 });
 
@@ -32,4 +36,5 @@ export const {
     useGetSpendingByCategoryQuery,
     useGetAccountsSummaryQuery,
     useGetMonthlyTrendsQuery,
+    useGetDashboardBundleQuery,
 } = dashboardApi;
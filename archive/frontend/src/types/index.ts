@@ -145,6 +145,23 @@ export interface CategorySpending {
     amount: number;
 }
 
+export interface MonthlyTrend {
+    period: string;
+    label: string;
+    month: string;
+    income: number;
+    expense: number;
+    net: number;
+}
+
+export interface DashboardBundle {
+    overview?: DashboardOverview;
+    recent_transactions?: Transaction[];
+    spending_by_category?: CategorySpending[];
+    accounts_summary?: Account[];
+    monthly_trends?: MonthlyTrend[];
+}
+
 // Pagination types
 export interface PaginatedResponse<T> {
     items: T[];
@@ -121,7 +121,8 @@ Write-Host ""
 Write-Host "📝 Next Steps:" -ForegroundColor Cyan
 Write-Host "1. Update backend/.env with your PostgreSQL credentials" -ForegroundColor White
 Write-Host "2. Create database: createdb financial_tracker" -ForegroundColor White
-Write-Host "3. Seed categories: cd backend && python -m app.seed" -ForegroundColor White
-Write-Host "4. Start backend: cd backend && uvicorn app.main:app --reload" -ForegroundColor White
-Write-Host "5. Start frontend: cd frontend && npm run dev" -ForegroundColor White
+Write-Host "3. Apply migrations: cd backend && alembic upgrade head" -ForegroundColor White
+Write-Host "4. Seed categories: cd backend && python -m app.seed" -ForegroundColor White
+Write-Host "5. Start backend: cd backend && uvicorn app.main:app --reload" -ForegroundColor White
+Write-Host "6. Start frontend: cd frontend && npm run dev" -ForegroundColor White
 Write-Host ""